@@ -8,12 +8,35 @@ using the official SysML Jupyter kernel infrastructure.
 __version__ = "1.0.0"
 __author__ = "SysML v2 Visualization Project"
 
-from .kernel_api import SysMLKernelAPI
+# Views accepted by %viz, shared by the CLI and the kernel_api script
+VIEW_CHOICES = ("Default", "Tree", "State", "Interconnection", "Action", "Sequence", "Case", "MIXED")
 
-# Alias for consistency
-SysMLKernelVisualizer = SysMLKernelAPI
+# Public classes are resolved on first access so that importing the package
+# (e.g. for the CLI entry point) does not pull in jupyter_client
+_LAZY_ATTRIBUTES = {
+    "SysMLKernelAPI": (".kernel_api", "SysMLKernelAPI"),
+    # Alias for consistency
+    "SysMLKernelVisualizer": (".kernel_api", "SysMLKernelAPI"),
+    "AsyncSysMLKernelAPI": (".kernel_api", "AsyncSysMLKernelAPI"),
+}
 
 __all__ = [
     "SysMLKernelAPI",
     "SysMLKernelVisualizer",
-]
\ No newline at end of file
+    "AsyncSysMLKernelAPI",
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+        value = getattr(importlib.import_module(module_name, __name__), attribute)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
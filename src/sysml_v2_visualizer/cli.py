@@ -5,25 +5,93 @@ SysML v2 Visualization Tools - Command Line Interface
 Provides command-line access to SysML v2 visualization using the Kernel API method.
 """
 
-import argparse
+from __future__ import annotations
+
+import os
+import re
 import sys
-from pathlib import Path
-from typing import Optional
 
-try:
-    from .kernel_api import SysMLKernelAPI
-    from .utils import validate_method_dependencies, suggest_installation_commands, print_dependency_status, find_sysml_files, combine_sysml_files
-except ImportError:
-    from kernel_api import SysMLKernelAPI
-    from utils import validate_method_dependencies, suggest_installation_commands, print_dependency_status, find_sysml_files, combine_sysml_files
+VERSION_STRING = "SysML v2 Visualizer 1.0.0"
+
+
+def _discover_sysml_content(
+    elements: list[str],
+    verbose: bool,
+    exclude: list[str] | None = None
+) -> str | None:
+    """
+    Auto-discover .sysml files and combine the ones needed for elements.
+
+    Args:
+        elements: Element targets used to narrow the files; empty for all files
+        verbose: Enable verbose output
+        exclude: Additional directory names to skip during discovery
+
+    Returns:
+        Combined SysML content, or None if no .sysml files were found
+    """
+    from .utils import find_sysml_files, combine_sysml_files, select_sysml_files_for_element
+
+    # Auto-discover all .sysml files
+    sysml_files = find_sysml_files(exclude=exclude)
+    if not sysml_files:
+        print("❌ No .sysml files found in current directory or subdirectories")
+        return None
+
+    if verbose:
+        print(f"Auto-discovered {len(sysml_files)} .sysml files:")
+        for f in sysml_files:
+            print(f"  - {f}")
+
+    # Only send the kernel the files the requested elements depend on
+    if elements:
+        selected_files = select_sysml_files_for_element(sysml_files, elements)
+        if verbose and len(selected_files) < len(sysml_files):
+            print(f"Using {len(selected_files)} file(s) needed for {', '.join(elements)}")
+        sysml_files = selected_files
+
+    # Combine all files
+    return combine_sysml_files(sysml_files)
+
+
+def element_output_path(output_file: str, element: str) -> str:
+    """
+    Derive a per-element output path, e.g. out.svg -> out_Pkg_Part.svg.
+
+    An "{element}" placeholder in output_file, e.g. diagrams/{element}.svg,
+    is replaced instead of appending to the stem.
+
+    Args:
+        output_file: Base output SVG file path or pattern
+        element: Element rendered into the file
+
+    Returns:
+        Output path containing a filesystem-safe form of element
+    """
+    safe_element = re.sub(r"[^\w.-]+", "_", element).strip("_")
+    if "{element}" in output_file:
+        return output_file.replace("{element}", safe_element)
+    stem, extension = os.path.splitext(output_file)
+    return f"{stem}_{safe_element}{extension or '.svg'}"
+
+
+def _file_size(path: str) -> int | None:
+    """Return the size of path with a single stat call, or None if it is missing."""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
 
 
 def visualize_file(
     output_file: str,
-    view: Optional[str] = None,
-    style: Optional[str] = None,
-    element: Optional[str] = None,
-    verbose: bool = False
+    view: str | None = None,
+    style: str | None = None,
+    element: str | None = None,
+    verbose: bool = False,
+    use_cache: bool = True,
+    cache_dir: str | None = None,
+    exclude: list[str] | None = None
 ) -> bool:
     """
     Visualize SysML files using the SysML Kernel API with auto-discovery.
@@ -34,44 +102,36 @@ def visualize_file(
         style: Visualization style
         element: Specific element to visualize
         verbose: Enable verbose output
+        use_cache: Reuse a previously rendered SVG for identical input
+        cache_dir: SVG cache directory, defaults to the user cache dir
+        exclude: Additional directory names to skip during discovery
 
     Returns:
         True if successful, False otherwise
     """
     try:
-        visualizer = SysMLKernelAPI()
-
-        # Auto-discover all .sysml files
-        sysml_files = find_sysml_files()
-        if not sysml_files:
-            print("❌ No .sysml files found in current directory or subdirectories")
+        combined_content = _discover_sysml_content([element] if element else [], verbose, exclude)
+        if combined_content is None:
             return False
 
-        if verbose:
-            print(f"Auto-discovered {len(sysml_files)} .sysml files:")
-            for f in sysml_files:
-                print(f"  - {f}")
-
-        # Combine all files
-        combined_content = combine_sysml_files(sysml_files)
+        # The kernel API starts the kernel (and imports jupyter_client) only
+        # on a cache miss, so cache hits stay fast
+        from .kernel_api import SysMLKernelAPI
 
         if verbose:
             print("Using SysML Kernel API to visualize all discovered files")
 
         # Prepare visualization options
-        kwargs = {}
-        if view:
-            kwargs['view'] = view
-        if style:
-            kwargs['style'] = style
-        if element:
-            kwargs['element'] = element
+        kwargs = {key: value for key, value in (('view', view), ('style', style), ('element', element)) if value}
 
         # Use visualize_content instead of visualize_file
-        result_path = visualizer.visualize_content(combined_content, output_file, **kwargs)
+        with SysMLKernelAPI(verbose=verbose) as visualizer:
+            result_path = visualizer.visualize_content(
+                combined_content, output_file, use_cache=use_cache, cache_dir=cache_dir, **kwargs
+            )
 
-        if Path(result_path).exists():
-            file_size = Path(result_path).stat().st_size
+        file_size = _file_size(result_path)
+        if file_size is not None:
             print(f"✅ Success! Generated {file_size} byte SVG: {result_path}")
             return True
         else:
@@ -86,19 +146,157 @@ def visualize_file(
         return False
 
 
-def main():
-    """Main CLI entry point."""
+def _render_batch(
+    combined_content: str,
+    targets: list[tuple[str, str]],
+    view: str | None,
+    style: str | None,
+    verbose: bool = False
+) -> list[tuple[str, str | None]]:
+    """Render targets in one kernel session; also the worker function for --jobs."""
+    from .kernel_api import SysMLKernelAPI
+
+    with SysMLKernelAPI(verbose=verbose) as visualizer:
+        return visualizer.visualize_batch(combined_content, targets, view=view, style=style)
+
+
+def visualize_elements(
+    output_file: str,
+    elements: list[str],
+    view: str | None = None,
+    style: str | None = None,
+    verbose: bool = False,
+    use_cache: bool = True,
+    jobs: int = 1,
+    cache_dir: str | None = None,
+    exclude: list[str] | None = None
+) -> bool:
+    """
+    Visualize several elements in one kernel session, one SVG per element.
+
+    Each SVG is written next to output_file with the element name appended
+    to its stem (see element_output_path). With jobs > 1 the elements are
+    shared out between worker processes, each running its own kernel.
+
+    Args:
+        output_file: Base output SVG file path
+        elements: Elements to visualize
+        view: Visualization view type
+        style: Visualization style
+        verbose: Enable verbose output
+        use_cache: Reuse previously rendered SVGs for identical input
+        jobs: Number of kernels to render with in parallel
+        cache_dir: SVG cache directory, defaults to the user cache dir
+        exclude: Additional directory names to skip during discovery
+
+    Returns:
+        True if every element was rendered, False otherwise
+    """
+    try:
+        from .utils import svg_cache_key, load_cached_svg, store_cached_svg, ensure_output_directory
+
+        combined_content = _discover_sysml_content(elements, verbose, exclude)
+        if combined_content is None:
+            return False
+
+        targets = []
+        cache_keys = {}
+        for element in elements:
+            element_output = element_output_path(output_file, element)
+            ensure_output_directory(element_output)
+            cache_key = svg_cache_key(combined_content, view, style, element)
+            if use_cache and load_cached_svg(cache_key, element_output, cache_dir):
+                print(f"✅ Reused cached SVG for {element}: {element_output}")
+                continue
+            targets.append((element, element_output))
+            cache_keys[element_output] = cache_key
+
+        if not targets:
+            return True
+
+        jobs = max(1, min(jobs, len(targets)))
+        if jobs == 1:
+            if verbose:
+                print(f"Rendering {len(targets)} element(s) in one kernel session")
+            results = _render_batch(combined_content, targets, view, style, verbose)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            if verbose:
+                print(f"Rendering {len(targets)} element(s) across {jobs} kernels")
+
+            # Each worker starts one kernel, loads the model once and renders
+            # a round-robin share of the elements
+            shares = [targets[i::jobs] for i in range(jobs)]
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                share_results = executor.map(
+                    _render_batch,
+                    [combined_content] * jobs, shares, [view] * jobs, [style] * jobs, [verbose] * jobs
+                )
+                results = [result for share in share_results for result in share]
+
+        success = True
+        for element, result_path in results:
+            file_size = _file_size(result_path) if result_path else None
+            if file_size is not None:
+                store_cached_svg(cache_keys[result_path], result_path, cache_dir)
+                print(f"✅ Success! Generated {file_size} byte SVG for {element}: {result_path}")
+            else:
+                print(f"❌ Failed to generate SVG for {element}")
+                success = False
+
+        return success
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        if verbose:
+            import traceback
+            traceback.print_exc()
+        return False
+
+
+def _sniff_fast_path(argv: list[str]) -> None:
+    """
+    Handle flags that need no argument parsing before the parser is built.
+
+    --version and --check-deps do not depend on any other option, so they
+    are answered straight from argv and the process exits.
+
+    Args:
+        argv: Command-line arguments (without the program name)
+    """
+    if "--version" in argv:
+        print(VERSION_STRING)
+        sys.exit(0)
+
+    if "--check-deps" in argv:
+        from .utils import print_dependency_status
+        print_dependency_status()
+        sys.exit(0)
+
+
+def _build_parser():
+    """Build the argument parser for the full visualization CLI."""
+    import argparse
+
+    from . import VIEW_CHOICES
+
     parser = argparse.ArgumentParser(
         description="SysML v2 Visualization Tools - Generate authentic SVG diagrams from SysML files using the official SysML Jupyter kernel",
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+        epilog=f"""
 Examples:
   # Auto-discovery mode (finds all .sysml files in repo)
   sysml-visualize output.svg --element "VehicleExample::Vehicle"
   sysml-visualize output.svg --element "PackageName::ElementName" --view Interconnection
   sysml-visualize output.svg --element "MyPackage" --view Tree --style stdcolor
 
-Available views: Default, Tree, State, Interconnection, Action, Sequence, Case, MIXED
+  # Several elements in one kernel session (writes output_Pkg_A.svg, output_Pkg_B.svg)
+  sysml-visualize output.svg --elements "Pkg::A,Pkg::B"
+  sysml-visualize "diagrams/{{element}}.svg" --element Pkg::A --element Pkg::B
+  sysml-visualize output.svg --elements "Pkg::A,Pkg::B,Pkg::C" --jobs 2
+
+Available views: {', '.join(VIEW_CHOICES)}
 Available styles: stdcolor, sysmlbw, monochrome, (and custom kernel styles)
         """
     )
@@ -119,7 +317,7 @@ Available styles: stdcolor, sysmlbw, monochrome, (and custom kernel styles)
     parser.add_argument(
         "--version",
         action="version",
-        version="SysML v2 Visualizer 1.0.0"
+        version=VERSION_STRING
     )
 
     parser.add_argument(
@@ -128,6 +326,17 @@ Available styles: stdcolor, sysmlbw, monochrome, (and custom kernel styles)
         help="Check dependency status and exit"
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-render instead of reusing a cached SVG for unchanged input"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for cached SVGs (default: $XDG_CACHE_HOME/sysml-visualizer)"
+    )
+
     parser.add_argument(
         "--diagnose",
         action="store_true",
@@ -137,7 +346,7 @@ Available styles: stdcolor, sysmlbw, monochrome, (and custom kernel styles)
     # Visualization options
     parser.add_argument(
         "--view",
-        choices=["Default", "Tree", "State", "Interconnection", "Action", "Sequence", "Case", "MIXED"],
+        choices=VIEW_CHOICES,
         help="Visualization view type"
     )
 
@@ -148,20 +357,51 @@ Available styles: stdcolor, sysmlbw, monochrome, (and custom kernel styles)
 
     parser.add_argument(
         "--element",
-        help="Specific element to visualize, e.g., 'PackageName::ElementName'"
+        action="append",
+        help="Specific element to visualize, e.g., 'PackageName::ElementName'; "
+             "repeat to render several elements in one kernel session"
     )
 
+    parser.add_argument(
+        "--elements",
+        help="Comma-separated elements to render in one kernel session; "
+             "writes one SVG per element named after output_file"
+    )
+
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="DIR",
+        help="Directory name to skip when discovering .sysml files (repeatable); "
+             "hidden directories, node_modules, venv, build and dist are always skipped"
+    )
+
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Render multiple elements with N kernels in parallel (default: 1)"
+    )
+
+    return parser
+
+
+def main():
+    """Main CLI entry point."""
+    _sniff_fast_path(sys.argv[1:])
+
+    parser = _build_parser()
     args = parser.parse_args()
 
     # Check dependencies if requested
     if args.check_deps:
+        from .utils import print_dependency_status
         available_methods = print_dependency_status()
         sys.exit(0)
 
     # Run detailed diagnostics if requested
     if args.diagnose:
         from .utils import get_kernel_diagnostics
-        import json
 
         print("🔬 Detailed Diagnostics:")
         print("=" * 50)
@@ -202,7 +442,6 @@ Available styles: stdcolor, sysmlbw, monochrome, (and custom kernel styles)
                 print(f"  • {error}")
 
         print(f"\nEnvironment Variables:")
-        import os
         relevant_vars = ['PATH', 'CONDA_DEFAULT_ENV', 'CONDA_PREFIX', 'JUPYTER_PATH']
         for var in relevant_vars:
             value = os.environ.get(var, 'Not set')
@@ -223,27 +462,60 @@ Available styles: stdcolor, sysmlbw, monochrome, (and custom kernel styles)
     if not args.output_file:
         parser.error("output_file is required for visualization operations")
 
+    elements = list(args.element or [])
+    if args.elements:
+        elements += [e.strip() for e in args.elements.split(",") if e.strip()]
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
     # Validate kernel dependencies
+    from .utils import validate_method_dependencies, suggest_installation_commands, ensure_output_directory
     missing_deps = validate_method_dependencies("kernel-api")
     if missing_deps:
         print(suggest_installation_commands("kernel-api"))
         sys.exit(1)
 
-    # Create output directory if needed
-    output_path = Path(args.output_file)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
     # Perform visualization
+    if len(elements) > 1:
+        success = visualize_elements(
+            args.output_file,
+            elements,
+            args.view,
+            args.style,
+            args.verbose,
+            use_cache=not args.no_cache,
+            jobs=args.jobs,
+            cache_dir=args.cache_dir,
+            exclude=args.exclude
+        )
+        sys.exit(0 if success else 1)
+
+    element = elements[0] if elements else None
+    output_file = args.output_file
+    if element and "{element}" in output_file:
+        output_file = element_output_path(output_file, element)
+
+    # Create output directory if needed
+    ensure_output_directory(output_file)
     success = visualize_file(
-        args.output_file,
+        output_file,
         args.view,
         args.style,
-        args.element,
-        args.verbose
+        element,
+        args.verbose,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        exclude=args.exclude
     )
 
     sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
+    if not __package__:
+        # Executed as a plain script (python cli.py): make the package-relative
+        # imports used above resolvable
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        __package__ = "sysml_v2_visualizer"
     main()
\ No newline at end of file
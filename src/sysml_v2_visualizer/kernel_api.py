@@ -17,20 +17,243 @@ Requirements:
 - jupyter-client Python package
 
 Example Usage:
-    api = SysMLKernelAPI()
-    if api.start_kernel():
+    with SysMLKernelAPI() as api:
         outputs = api.visualize(sysml_code)
-        api.stop_kernel()
 
 Author: Generated for SysML v2 visualization CI/CD pipeline
 License: MIT
 """
 
-from jupyter_client import KernelManager
+import asyncio
+import atexit
+import os
+import queue
+import re
 import sys
-from pathlib import Path
 
-class SysMLKernelAPI:
+# Package name in the kernel's execute_result, e.g. "Package Demo (id)"
+_PKG_RE = re.compile(r'Package\s+(\w+)')
+
+# Seconds execute_code() waits for the next iopub message before giving up
+IOPUB_TIMEOUT = 10
+
+# Convert iopub message content into the output dicts returned by execute_code()
+_OUTPUT_HANDLERS = {
+    'execute_result': lambda content: {
+        'type': 'execute_result',
+        'data': content['data']
+    },
+    'display_data': lambda content: {
+        'type': 'display_data',
+        'data': content['data']
+    },
+    'stream': lambda content: {
+        'type': 'stream',
+        'name': content['name'],
+        'text': content['text']
+    },
+    'error': lambda content: {
+        'type': 'error',
+        'ename': content['ename'],
+        'evalue': content['evalue'],
+        'traceback': content['traceback']
+    },
+}
+
+
+def _route_message(msg, outputs, pending, skipped_types):
+    """
+    Add an iopub message to the outputs of the request it belongs to.
+
+    Args:
+        msg (dict): iopub message
+        outputs (dict): msg_id -> list of output dicts being collected
+        pending (set): msg_ids still running; updated when one reports idle
+        skipped_types (tuple): Message types to discard
+    """
+    # Dropped message types are discarded before any nested lookups
+    msg_type = msg.get('msg_type')
+    if msg_type in skipped_types:
+        return
+
+    parent_id = msg.get('parent_header', {}).get('msg_id')
+    if parent_id not in outputs:
+        return
+
+    if msg_type == 'status':
+        if msg['content']['execution_state'] == 'idle':
+            pending.discard(parent_id)
+        return
+
+    handler = _OUTPUT_HANDLERS.get(msg_type)
+    if handler:
+        outputs[parent_id].append(handler(msg['content']))
+
+
+def _detect_package_name(outputs):
+    """Return the package name from a model's execute_result outputs, or None."""
+    for output in outputs:
+        if output['type'] != 'execute_result' or 'data' not in output:
+            continue
+        text = output['data'].get('text/plain', '')
+        if not text.startswith('Package '):
+            continue
+        match = _PKG_RE.match(text)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _viz_command(view_type, style, target):
+    """Build the %viz magic command for a target."""
+    viz_cmd = f"%viz --view {view_type}"
+    if style:
+        viz_cmd += f" --style {style}"
+    return f"{viz_cmd} {target}"
+
+
+def _extract_svg(outputs):
+    """Return the first SVG payload found in kernel outputs, or None."""
+    # Only display_data and execute_result outputs carry a data bundle
+    for output in outputs:
+        data = output.get('data')
+        if data and 'image/svg+xml' in data:
+            return data['image/svg+xml']
+    return None
+
+
+def _write_svg(output_file, svg_content):
+    """Atomically write SVG content (str or bytes) to output_file."""
+    from .utils import write_file_atomic
+
+    svg_bytes = svg_content.encode('utf-8') if isinstance(svg_content, str) else svg_content
+    write_file_atomic(output_file, svg_bytes)
+
+
+def _discover_sysml_code():
+    """Combine all .sysml files below the current directory, for visualize_file()."""
+    from .utils import find_sysml_files, combine_sysml_files
+
+    # Auto-discover all .sysml files
+    sysml_files = find_sysml_files()
+    if not sysml_files:
+        raise FileNotFoundError("No .sysml files found in current directory or subdirectories")
+
+    return combine_sysml_files(sysml_files)
+
+
+def _visualize_steps(sysml_code, view, style, element, log):
+    """
+    Plan a visualization as a series of kernel requests.
+
+    This holds the visualize() logic shared by SysMLKernelAPI and
+    AsyncSysMLKernelAPI, which differ only in how they wait for the kernel.
+    The generator yields tuples of code to submit back to back and must be
+    sent the list of outputs of each request, in the same order.
+
+    Args:
+        sysml_code (str): SysML code to execute first, or None
+        view (str): Visualization view type, defaults to Tree
+        style (str): Visualization style, or None
+        element (str): Element to visualize; detected from the model if None
+        log (callable): Progress logger
+
+    Returns:
+        tuple: (outputs, svg_content), svg_content being None without SVG
+    """
+    outputs = []
+    view_type = view if view else "Tree"
+
+    if sysml_code and element:
+        # The target is known up front, so submit the model and %viz back
+        # to back; the kernel starts on %viz while model output drains
+        target = element
+        viz_cmd = _viz_command(view_type, style, target)
+        log("Executing SysML model...")
+        log(f"Generating visualization with %viz...\nExecuting: {viz_cmd}")
+        model_outputs, viz_outputs = yield (sysml_code, viz_cmd)
+        outputs.extend(model_outputs)
+    else:
+        # First execute the SysML code if provided
+        if sysml_code:
+            log("Executing SysML model...")
+            model_outputs, = yield (sysml_code,)
+            outputs.extend(model_outputs)
+
+        # Use user-specified element or the package detected in the model output
+        target = element
+        if not target:
+            target = _detect_package_name(outputs)
+            if target:
+                log(f"Detected package name: {target}")
+            else:
+                target = "Demo"  # fallback
+
+        viz_cmd = _viz_command(view_type, style, target)
+        log(f"Generating visualization with %viz...\nExecuting: {viz_cmd}")
+        viz_outputs, = yield (viz_cmd,)
+
+    outputs.extend(viz_outputs)
+    svg_content = _extract_svg(viz_outputs)
+
+    # If primary command failed, try fallback with Tree view
+    if not svg_content and view_type != "Tree":
+        print(f"Primary view '{view_type}' failed, trying Tree view as fallback...")
+        viz_cmd = f"%viz --view Tree {target}"
+        log(f"Executing: {viz_cmd}")
+        fallback_outputs, = yield (viz_cmd,)
+        outputs.extend(fallback_outputs)
+        svg_content = _extract_svg(fallback_outputs)
+
+    if svg_content:
+        log(f"✅ Got SVG with command: {viz_cmd}")
+    return outputs, svg_content
+
+
+class _KernelAPIBase:
+    """State and helpers shared by SysMLKernelAPI and AsyncSysMLKernelAPI."""
+
+    def __init__(self, verbose=False):
+        """
+        Initialize the SysML Kernel API.
+
+        Args:
+            verbose (bool, optional): Print progress messages and echo executed
+                                      code; errors and warnings are always printed
+        """
+        self.verbose = verbose
+        self.km = None
+        self.kc = None
+        # SysML content last executed in the running kernel
+        self._loaded_content = None
+
+    def _log(self, message):
+        """Print a progress message when verbose output is enabled."""
+        if self.verbose:
+            print(message)
+
+    def _submit(self, code):
+        """Send an execute request without waiting for it and return its msg_id."""
+        self._log(f"Executing SysML code:\n{code}")
+        return self.kc.execute(code)
+
+    def _model_code(self, sysml_content, element):
+        """Return the model code a render must execute, or None if the kernel already holds it."""
+        # Re-executing a model the kernel already holds would only redefine
+        # it; with an explicit element no package detection is needed either
+        if element and sysml_content == self._loaded_content:
+            return None
+        return sysml_content
+
+    def _reset(self):
+        """Forget the stopped kernel."""
+        self.km = None
+        self.kc = None
+        self._loaded_content = None
+        self._log("✅ Kernel stopped")
+
+
+class SysMLKernelAPI(_KernelAPIBase):
     """
     Python API for interfacing with the official SysML v2 Jupyter kernel.
 
@@ -38,21 +261,25 @@ class SysMLKernelAPI:
     to execute SysML code and generate visualizations using the same engine
     that powers the Jupyter notebook %viz magic commands.
 
+    The kernel is started lazily and kept warm between calls, so repeated
+    visualize_content() calls pay the kernel startup cost only once. It is
+    stopped by close(), on leaving a with-block, or at interpreter exit.
+
     Attributes:
         km: KernelManager instance for managing the SysML kernel
         kc: KernelClient instance for communicating with the kernel
+        verbose: Print progress and the code sent to the kernel
 
     Example:
-        >>> api = SysMLKernelAPI()
-        >>> api.start_kernel()
-        >>> outputs = api.visualize("package Demo { part def Vehicle; }")
-        >>> api.stop_kernel()
+        >>> with SysMLKernelAPI() as api:
+        ...     outputs = api.visualize("package Demo { part def Vehicle; }")
     """
 
-    def __init__(self):
-        """Initialize the SysML Kernel API."""
-        self.km = None
-        self.kc = None
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def start_kernel(self):
         """
@@ -60,6 +287,7 @@ class SysMLKernelAPI:
 
         Initializes a new SysML kernel instance and establishes communication
         channels. The kernel must be started before executing any SysML code.
+        Calling this while a kernel is already running is a no-op.
 
         Returns:
             bool: True if kernel started successfully, False otherwise
@@ -67,66 +295,85 @@ class SysMLKernelAPI:
         Raises:
             Exception: If kernel initialization fails
         """
-        print("Starting SysML kernel...")
+        if self.km is not None and self.km.is_alive():
+            return True
+        if self.km is not None:
+            # The previous kernel died; release its channels before replacing it
+            self.stop_kernel()
+
+        # jupyter_client (and zmq) are only imported once a kernel is needed
+        from jupyter_client import KernelManager
+
+        self._log("Starting SysML kernel...")
         self.km = KernelManager(kernel_name='sysml')
         self.km.start_kernel()
         self.kc = self.km.client()
         self.kc.start_channels()
+        self._loaded_content = None
+        # Shut the kernel down at exit if the caller never does; stop_kernel()
+        # unregisters this so stopped instances are not kept alive
+        atexit.register(self.stop_kernel)
 
         # Wait for kernel to be ready
         try:
             self.kc.wait_for_ready(timeout=30)
-            print("✅ SysML kernel is ready")
+            self._log("✅ SysML kernel is ready")
             return True
         except Exception as e:
             print(f"❌ Failed to start kernel: {e}")
+            # Shut down the kernel that never became ready, so the next
+            # call starts a fresh one instead of reusing it
+            self.stop_kernel()
             return False
 
-    def execute_code(self, code):
-        """Execute SysML code in the kernel"""
+    def execute_code(self, code, include_streams=True):
+        """
+        Execute SysML code in the kernel.
+
+        Args:
+            code (str): SysML code or magic command to execute
+            include_streams (bool, optional): Keep stdout/stderr stream outputs;
+                                              disable when only results are needed
+
+        Returns:
+            list: Output dicts produced by the request
+        """
         if not self.kc:
             raise RuntimeError("Kernel not started")
 
-        print(f"Executing SysML code:\n{code}")
+        msg_id = self._submit(code)
+        return self._drain_until_idle((msg_id,), include_streams)[msg_id]
+
+    def _drain_until_idle(self, msg_ids, include_streams=True):
+        """
+        Collect outputs for several submitted requests at once.
+
+        Messages are routed to their request by parent msg_id, so requests
+        submitted back to back can be drained together.
 
-        # Execute the code
-        msg_id = self.kc.execute(code)
+        Args:
+            msg_ids (iterable): msg_ids returned by _submit()
+            include_streams (bool, optional): Keep stream outputs
 
-        # Collect outputs
-        outputs = []
-        while True:
+        Returns:
+            dict: msg_id -> list of output dicts, as returned by execute_code()
+        """
+        outputs = {msg_id: [] for msg_id in msg_ids}
+        pending = set(outputs)
+        skipped_types = () if include_streams else ('stream',)
+
+        # get_iopub_msg returns as soon as a message arrives, so the timeout
+        # only bounds how long a silent kernel is waited for.
+        get_iopub_msg = self.kc.get_iopub_msg
+        while pending:
             try:
-                msg = self.kc.get_iopub_msg(timeout=10)
-                if msg['parent_header']['msg_id'] == msg_id:
-                    if msg['msg_type'] == 'execute_result':
-                        outputs.append({
-                            'type': 'execute_result',
-                            'data': msg['content']['data']
-                        })
-                    elif msg['msg_type'] == 'display_data':
-                        outputs.append({
-                            'type': 'display_data',
-                            'data': msg['content']['data']
-                        })
-                    elif msg['msg_type'] == 'stream':
-                        outputs.append({
-                            'type': 'stream',
-                            'name': msg['content']['name'],
-                            'text': msg['content']['text']
-                        })
-                    elif msg['msg_type'] == 'error':
-                        outputs.append({
-                            'type': 'error',
-                            'ename': msg['content']['ename'],
-                            'evalue': msg['content']['evalue'],
-                            'traceback': msg['content']['traceback']
-                        })
-                    elif msg['msg_type'] == 'status' and msg['content']['execution_state'] == 'idle':
-                        break
-            except Exception as e:
-                print(f"Timeout or error getting message: {e}")
+                msg = get_iopub_msg(timeout=IOPUB_TIMEOUT)
+            except queue.Empty:
+                print(f"Timeout waiting for kernel output after {IOPUB_TIMEOUT}s")
                 break
 
+            _route_message(msg, outputs, pending, skipped_types)
+
         return outputs
 
     def visualize(self, sysml_code=None, view=None, style=None, element=None):
@@ -157,83 +404,33 @@ class SysMLKernelAPI:
             >>> outputs = api.visualize(sysml_code, view='Interconnection', style='stdcolor')
             >>> outputs = api.visualize(sysml_code, view='Tree', element='VehicleExample::Vehicle')
         """
-        outputs = []
+        return self._visualize(sysml_code, view=view, style=style, element=element)[0]
 
-        # First execute the SysML code if provided
-        if sysml_code:
-            print("Executing SysML model...")
-            model_outputs = self.execute_code(sysml_code)
-            outputs.extend(model_outputs)
+    def _visualize(self, sysml_code=None, view=None, style=None, element=None, include_streams=True):
+        """
+        Run visualize() and return (outputs, svg_content).
 
-        # Then execute %viz magic command
-        print("Generating visualization with %viz...")
-
-        # Extract package name from previous outputs if needed
-        package_name = None
-        for output in outputs:
-            if output['type'] == 'execute_result' and 'data' in output:
-                text = output['data'].get('text/plain', '')
-                if text.startswith('Package '):
-                    # Extract package name like "Package Demo (id)"
-                    import re
-                    match = re.match(r'Package (\w+)', text)
-                    if match:
-                        package_name = match.group(1)
-                        print(f"Detected package name: {package_name}")
-                        break
-
-        if not package_name:
-            package_name = "Demo"  # fallback
-
-        # Build %viz command with user-specified options
-        viz_cmd = "%viz"
-
-        # Add view option (default to Tree if not specified)
-        view_type = view if view else "Tree"
-        viz_cmd += f" --view {view_type}"
-
-        # Add style option if specified
-        if style:
-            viz_cmd += f" --style {style}"
-
-        # Add target element (use user-specified element or detected package)
-        target = element if element else package_name
-        viz_cmd += f" {target}"
-
-        print(f"Executing: {viz_cmd}")
-        viz_outputs = self.execute_code(viz_cmd)
-        outputs.extend(viz_outputs)
-
-        # Check if we got SVG output
-        for output in viz_outputs:
-            if output['type'] == 'display_data' and 'data' in output:
-                if 'image/svg+xml' in output['data']:
-                    print(f"✅ Got SVG with command: {viz_cmd}")
-                    return outputs
-            elif output['type'] == 'execute_result' and 'data' in output:
-                if 'image/svg+xml' in output['data']:
-                    print(f"✅ Got SVG with command: {viz_cmd}")
-                    return outputs
-
-        # If primary command failed, try fallback with Tree view
-        if view_type != "Tree":
-            print(f"Primary view '{view_type}' failed, trying Tree view as fallback...")
-            fallback_cmd = f"%viz --view Tree {target}"
-            print(f"Executing fallback: {fallback_cmd}")
-            fallback_outputs = self.execute_code(fallback_cmd)
-            outputs.extend(fallback_outputs)
-
-            for output in fallback_outputs:
-                if output['type'] == 'display_data' and 'data' in output:
-                    if 'image/svg+xml' in output['data']:
-                        print(f"✅ Got SVG with fallback command: {fallback_cmd}")
-                        return outputs
-                elif output['type'] == 'execute_result' and 'data' in output:
-                    if 'image/svg+xml' in output['data']:
-                        print(f"✅ Got SVG with fallback command: {fallback_cmd}")
-                        return outputs
+        svg_content is None when no SVG was produced. Internal renders pass
+        include_streams=False since they only need the SVG and package name.
+        """
+        if not self.start_kernel():
+            raise RuntimeError("SysML kernel failed to start")
+        steps = _visualize_steps(sysml_code, view, style, element, self._log)
+        result = self._run_steps(steps, include_streams)
+        if sysml_code:
+            self._loaded_content = sysml_code
+        return result
 
-        return outputs
+    def _run_steps(self, steps, include_streams):
+        """Execute the requests planned by a _visualize_steps() generator and return its result."""
+        try:
+            codes = next(steps)
+            while True:
+                msg_ids = [self._submit(code) for code in codes]
+                replies = self._drain_until_idle(msg_ids, include_streams)
+                codes = steps.send([replies[msg_id] for msg_id in msg_ids])
+        except StopIteration as done:
+            return done.value
 
     def visualize_file(self, output_file=None, view=None, style=None, element=None):
         """
@@ -249,18 +446,11 @@ class SysMLKernelAPI:
         Returns:
             str: Path to output file or 'kernel_output.svg' if no output specified
         """
-        from pathlib import Path
-        from .utils import find_sysml_files, combine_sysml_files
-
-        # Auto-discover all .sysml files
-        sysml_files = find_sysml_files()
-        if not sysml_files:
-            raise FileNotFoundError("No .sysml files found in current directory or subdirectories")
-
-        sysml_code = combine_sysml_files(sysml_files)
+        sysml_code = _discover_sysml_code()
         return self.visualize_content(sysml_code, output_file, view=view, style=style, element=element)
 
-    def visualize_content(self, sysml_content, output_file=None, view=None, style=None, element=None):
+    def visualize_content(self, sysml_content, output_file=None, view=None, style=None, element=None,
+                          use_cache=False, cache_dir=None):
         """
         Visualize SysML content and optionally save to output file.
 
@@ -270,52 +460,293 @@ class SysMLKernelAPI:
             view (str, optional): Visualization view type
             style (str, optional): Visualization style
             element (str, optional): Specific element to visualize
+            use_cache (bool, optional): Reuse an SVG previously rendered from identical
+                                        input instead of running the kernel
+            cache_dir (str, optional): SVG cache directory, defaults to the user cache dir
 
         Returns:
             str: Path to output file or 'kernel_output.svg' if no output specified
         """
-        from pathlib import Path
+        output_path = output_file or "kernel_output.svg"
 
-        # Generate visualization
-        self.start_kernel()
-        try:
-            outputs = self.visualize(sysml_content, view=view, style=style, element=element)
-
-            # Extract SVG from outputs
-            svg_content = None
-            for output in outputs:
-                if output['type'] == 'display_data' and 'data' in output:
-                    if 'image/svg+xml' in output['data']:
-                        svg_content = output['data']['image/svg+xml']
-                        break
-                elif output['type'] == 'execute_result' and 'data' in output:
-                    if 'image/svg+xml' in output['data']:
-                        svg_content = output['data']['image/svg+xml']
-                        break
+        if use_cache:
+            from .utils import svg_cache_key, load_cached_svg, store_cached_svg
+
+            cache_key = svg_cache_key(sysml_content, view, style, element)
+            if load_cached_svg(cache_key, output_path, cache_dir):
+                return output_path
 
+        # Generate visualization; the kernel stays running for later calls
+        svg_content = self._render_svg(sysml_content, view=view, style=style, element=element)
+
+        if not svg_content:
+            raise RuntimeError("No SVG content generated from kernel")
+
+        # Encode once and replace the output file atomically
+        _write_svg(output_path, svg_content)
+
+        if use_cache:
+            store_cached_svg(cache_key, output_path, cache_dir)
+
+        return output_path
+
+    def visualize_batch(self, sysml_content, targets, view=None, style=None):
+        """
+        Visualize several elements of the same SysML content in one kernel session.
+
+        The model is executed only once; each element then costs a single
+        %viz round-trip.
+
+        Args:
+            sysml_content (str): SysML content to visualize
+            targets (list): (element, output_file) pairs to render
+            view (str, optional): Visualization view type
+            style (str, optional): Visualization style
+
+        Returns:
+            list: (element, output_file) pairs, with output_file set to None
+                 for elements that produced no SVG
+        """
+        results = []
+        for element, output_file in targets:
+            svg_content = self._render_svg(sysml_content, view=view, style=style, element=element)
             if not svg_content:
-                raise RuntimeError("No SVG content generated from kernel")
+                results.append((element, None))
+                continue
 
-            # Save to output file
-            output_path = output_file or "kernel_output.svg"
-            Path(output_path).write_text(svg_content)
+            _write_svg(output_file, svg_content)
+            results.append((element, output_file))
 
-            return output_path
+        return results
 
-        finally:
-            self.stop_kernel()
+    def _render_svg(self, sysml_content, view=None, style=None, element=None):
+        """Render SysML content in the (lazily started) kernel and return the SVG, or None."""
+        if not self.start_kernel():
+            raise RuntimeError("SysML kernel failed to start")
+        model_code = self._model_code(sysml_content, element)
+        return self._visualize(model_code, view=view, style=style, element=element, include_streams=False)[1]
 
     def stop_kernel(self):
         """Stop the kernel"""
+        if self.km is None and self.kc is None:
+            return
+        atexit.unregister(self.stop_kernel)
         if self.kc:
             self.kc.stop_channels()
         if self.km:
             self.km.shutdown_kernel()
-        print("✅ Kernel stopped")
+        self._reset()
+
+    def close(self):
+        """Stop the kernel if it is running; the API can be reused afterwards."""
+        self.stop_kernel()
+
+
+class AsyncSysMLKernelAPI(_KernelAPIBase):
+    """
+    asyncio counterpart of SysMLKernelAPI built on AsyncKernelManager.
+
+    Offers the same calls as SysMLKernelAPI as coroutines. Kernel waits do
+    not block the event loop, so several instances (one kernel each) can
+    render concurrently with asyncio.gather(), or overlap with other I/O.
+    The kernel is started lazily and kept warm until close() or the end of
+    an ``async with`` block; unlike SysMLKernelAPI it is not stopped
+    automatically at interpreter exit.
+
+    Example:
+        >>> async with AsyncSysMLKernelAPI() as api:
+        ...     await api.visualize_content(sysml_code, "vehicle.svg", element="VehicleExample")
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def start_kernel(self):
+        """
+        Start the SysML v2 Jupyter kernel; a no-op while one is running.
+
+        Returns:
+            bool: True if kernel started successfully, False otherwise
+        """
+        if self.km is not None and await self.km.is_alive():
+            return True
+        if self.km is not None:
+            await self.stop_kernel()
+
+        from jupyter_client import AsyncKernelManager
+
+        self._log("Starting SysML kernel...")
+        self.km = AsyncKernelManager(kernel_name='sysml')
+        await self.km.start_kernel()
+        self.kc = self.km.client()
+        self.kc.start_channels()
+        self._loaded_content = None
+
+        try:
+            await self.kc.wait_for_ready(timeout=30)
+            self._log("✅ SysML kernel is ready")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to start kernel: {e}")
+            await self.stop_kernel()
+            return False
+
+    async def execute_code(self, code, include_streams=True):
+        """
+        Execute SysML code in the kernel.
+
+        Args:
+            code (str): SysML code or magic command to execute
+            include_streams (bool, optional): Keep stdout/stderr stream outputs
+
+        Returns:
+            list: Output dicts produced by the request
+        """
+        if not self.kc:
+            raise RuntimeError("Kernel not started")
+
+        msg_id = self._submit(code)
+        return (await self._drain_until_idle((msg_id,), include_streams))[msg_id]
+
+    async def _drain_until_idle(self, msg_ids, include_streams=True):
+        """Collect outputs for submitted requests, as SysMLKernelAPI._drain_until_idle()."""
+        outputs = {msg_id: [] for msg_id in msg_ids}
+        pending = set(outputs)
+        skipped_types = () if include_streams else ('stream',)
+
+        while pending:
+            try:
+                msg = await self.kc.get_iopub_msg(timeout=IOPUB_TIMEOUT)
+            except queue.Empty:
+                print(f"Timeout waiting for kernel output after {IOPUB_TIMEOUT}s")
+                break
+
+            _route_message(msg, outputs, pending, skipped_types)
+
+        return outputs
+
+    async def visualize(self, sysml_code=None, view=None, style=None, element=None):
+        """
+        Execute SysML code and generate a visualization, as SysMLKernelAPI.visualize().
+
+        Returns:
+            list: List of kernel output messages
+        """
+        return (await self._visualize(sysml_code, view=view, style=style, element=element))[0]
+
+    async def _visualize(self, sysml_code=None, view=None, style=None, element=None, include_streams=True):
+        """Run visualize() and return (outputs, svg_content), svg_content being None without SVG."""
+        if not await self.start_kernel():
+            raise RuntimeError("SysML kernel failed to start")
+        steps = _visualize_steps(sysml_code, view, style, element, self._log)
+        result = await self._run_steps(steps, include_streams)
+        if sysml_code:
+            self._loaded_content = sysml_code
+        return result
+
+    async def _run_steps(self, steps, include_streams):
+        """Execute the requests planned by a _visualize_steps() generator and return its result."""
+        try:
+            codes = next(steps)
+            while True:
+                msg_ids = [self._submit(code) for code in codes]
+                replies = await self._drain_until_idle(msg_ids, include_streams)
+                codes = steps.send([replies[msg_id] for msg_id in msg_ids])
+        except StopIteration as done:
+            return done.value
+
+    async def visualize_file(self, output_file=None, view=None, style=None, element=None):
+        """
+        Visualize all .sysml files below the current directory, as SysMLKernelAPI.visualize_file().
+
+        Returns:
+            str: Path to output file or 'kernel_output.svg' if no output specified
+        """
+        loop = asyncio.get_running_loop()
+        sysml_code = await loop.run_in_executor(None, _discover_sysml_code)
+        return await self.visualize_content(sysml_code, output_file, view=view, style=style, element=element)
+
+    async def visualize_content(self, sysml_content, output_file=None, view=None, style=None, element=None,
+                                use_cache=False, cache_dir=None):
+        """
+        Visualize SysML content and save the SVG, as SysMLKernelAPI.visualize_content().
+
+        Returns:
+            str: Path to output file or 'kernel_output.svg' if no output specified
+        """
+        # File I/O runs in worker threads so other kernels keep being serviced
+        loop = asyncio.get_running_loop()
+        output_path = output_file or "kernel_output.svg"
+
+        if use_cache:
+            from .utils import svg_cache_key, load_cached_svg, store_cached_svg
+
+            cache_key = svg_cache_key(sysml_content, view, style, element)
+            if await loop.run_in_executor(None, load_cached_svg, cache_key, output_path, cache_dir):
+                return output_path
+
+        svg_content = await self._render_svg(sysml_content, view=view, style=style, element=element)
+        if not svg_content:
+            raise RuntimeError("No SVG content generated from kernel")
+
+        await loop.run_in_executor(None, _write_svg, output_path, svg_content)
+
+        if use_cache:
+            await loop.run_in_executor(None, store_cached_svg, cache_key, output_path, cache_dir)
+
+        return output_path
+
+    async def visualize_batch(self, sysml_content, targets, view=None, style=None):
+        """
+        Visualize several elements of the same SysML content, as SysMLKernelAPI.visualize_batch().
+
+        Returns:
+            list: (element, output_file) pairs, with output_file set to None
+                 for elements that produced no SVG
+        """
+        loop = asyncio.get_running_loop()
+        results = []
+        for element, output_file in targets:
+            svg_content = await self._render_svg(sysml_content, view=view, style=style, element=element)
+            if not svg_content:
+                results.append((element, None))
+                continue
+
+            await loop.run_in_executor(None, _write_svg, output_file, svg_content)
+            results.append((element, output_file))
+
+        return results
+
+    async def _render_svg(self, sysml_content, view=None, style=None, element=None):
+        """Render SysML content in the (lazily started) kernel and return the SVG, or None."""
+        if not await self.start_kernel():
+            raise RuntimeError("SysML kernel failed to start")
+        model_code = self._model_code(sysml_content, element)
+        return (await self._visualize(model_code, view=view, style=style, element=element, include_streams=False))[1]
+
+    async def stop_kernel(self):
+        """Stop the kernel"""
+        if self.km is None and self.kc is None:
+            return
+        if self.kc:
+            self.kc.stop_channels()
+        if self.km:
+            await self.km.shutdown_kernel()
+        self._reset()
+
+    async def close(self):
+        """Stop the kernel if it is running; the API can be reused afterwards."""
+        await self.stop_kernel()
+
 
 def main():
     import argparse
 
+    from . import VIEW_CHOICES
+
     parser = argparse.ArgumentParser(
         description='SysML v2 Kernel API - Direct access to official SysML visualization',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -363,7 +794,7 @@ Available Styles:
     parser.add_argument('output', nargs='?', default='kernel_output.svg',
                        help='Output SVG file (default: kernel_output.svg)')
 
-    parser.add_argument('--view', choices=['Default', 'Tree', 'State', 'Interconnection', 'Action', 'Sequence', 'Case', 'MIXED'],
+    parser.add_argument('--view', choices=VIEW_CHOICES,
                        default='Tree', help='Visualization view type (default: Tree)')
 
     parser.add_argument('--style', help='Visualization style (e.g., stdcolor)')
@@ -375,7 +806,7 @@ Available Styles:
     command = args.command
     output_file = args.output
 
-    api = SysMLKernelAPI()
+    api = SysMLKernelAPI(verbose=True)
 
     try:
         if not api.start_kernel():
@@ -423,8 +854,7 @@ Available Styles:
                     print(f"SVG length: {len(svg_content)} characters")
 
                     # Save SVG to file
-                    with open(output_file, 'w') as f:
-                        f.write(svg_content)
+                    _write_svg(output_file, svg_content)
                     print(f"💾 Saved visualization to: {output_file}")
 
                 if 'text/plain' in data:
@@ -444,8 +874,7 @@ Available Styles:
                     print(f"SVG length: {len(svg_content)} characters")
 
                     # Save SVG to file
-                    with open(output_file, 'w') as f:
-                        f.write(svg_content)
+                    _write_svg(output_file, svg_content)
                     print(f"💾 Saved visualization to: {output_file}")
 
                 if 'text/plain' in data:
@@ -456,8 +885,7 @@ Available Styles:
                     if '<svg' in plain_text.lower():
                         print("📊 SVG content found in text/plain!")
                         svg_content = plain_text
-                        with open(output_file, 'w') as f:
-                            f.write(svg_content)
+                        _write_svg(output_file, svg_content)
                         print(f"💾 Saved SVG from text to: {output_file}")
 
             elif output['type'] == 'stream':
@@ -483,4 +911,9 @@ Available Styles:
         api.stop_kernel()
 
 if __name__ == "__main__":
+    if not __package__:
+        # Executed as a plain script (python kernel_api.py): make the
+        # package-relative imports used above resolvable
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        __package__ = "sysml_v2_visualizer"
     main()
\ No newline at end of file
@@ -2,11 +2,79 @@
 Utility functions for SysML v2 Visualization Tools
 """
 
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import re
 import subprocess
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import BinaryIO, Optional, Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple
+
+# A SysML name: a basic identifier or a quoted name such as 'Vehicle Model'
+_SYSML_NAME_PATTERN = r"(?:'(?:[^'\\\n]|\\.)*'|\w+)"
+# Package declarations, and any name a file uses: packages are referenced as
+# qualified-name prefixes ("VehicleExample::") but also bare ("import Parts;",
+# "alias P for Parts;")
+_PACKAGE_DECLARATION_RE = re.compile(rf"\bpackage\s+({_SYSML_NAME_PATTERN})")
+_SYSML_NAME_RE = re.compile(_SYSML_NAME_PATTERN)
+# First segment of a qualified element target, e.g. 'Vehicle Model' in 'Vehicle Model'::Engine
+_TARGET_PACKAGE_RE = re.compile(rf"\s*({_SYSML_NAME_PATTERN})")
+# String literals and comments; strings come first so "//" inside one is kept
+_STRING_OR_COMMENT_RE = re.compile(r'"(?:[^"\\]|\\.)*"|//[^\n]*|/\*.*?\*/', re.DOTALL)
+# SysML file names; extensions are matched case-insensitively (e.g. Model.SysML)
+_SYSML_FILE_RE = re.compile(r"\.sysml\Z", re.IGNORECASE)
+
+
+# Lower-cased OS name ("linux", "darwin", "windows") and the user's home
+# directory, looked up once
+_SYSTEM = platform.system().lower()
+_HOME = str(Path.home())
+
+# Conda installation prefixes searched for Jupyter data directories. Entries
+# of _CONDA_BASE_HOME_DIRS are relative to the user's home directory.
+_CONDA_BASE_HOME_DIRS = (
+    "miniconda", "miniconda3", "anaconda", "anaconda3",
+    "miniforge", "miniforge3", "mambaforge", "mambaforge3",
+)
+_CONDA_BASES_COMMON = (
+    "/opt/conda",
+    "/usr/local/conda",
+    "/opt/miniconda",
+    "/opt/miniconda3",
+    "/opt/anaconda",
+    "/opt/anaconda3",
+    "/opt/miniforge",
+    "/opt/miniforge3",
+    "/opt/mambaforge",
+    "/opt/mambaforge3",
+)
+_CONDA_BASES_BY_SYSTEM = {
+    "linux": (
+        "/usr/share/miniconda",
+        "/usr/share/anaconda",
+        "/usr/local/miniconda",
+        "/usr/local/anaconda",
+    ),
+    "darwin": (
+        "/usr/local/miniconda",
+        "/usr/local/anaconda",
+        "/Applications/miniconda",
+        "/Applications/anaconda",
+    ),
+}
+# Installs at the filesystem root, e.g. /miniforge3
+_CONDA_BASES_ROOT = ("/miniforge3", "/miniconda3", "/anaconda3")
+
+# Set once setup_jupyter_environment() has updated JUPYTER_PATH
+_jupyter_env_setup_done = False
 
 
 class DependencyError(Exception):
@@ -14,233 +82,198 @@ class DependencyError(Exception):
     pass
 
 
-def check_dependencies() -> Dict[str, bool]:
+@dataclass(frozen=True)
+class DependencyStatus:
+    """Availability of each dependency, as reported by check_dependencies()."""
+    jupyter_client: bool
+    conda: bool
+    sysml_kernel: bool
+    graphviz: bool
+    plantuml: bool
+
+
+@lru_cache(maxsize=1)
+def check_dependencies() -> DependencyStatus:
     """
     Check for required and optional dependencies.
 
+    The result is cached for the life of the process and shared between
+    callers; call invalidate_dependency_cache() to force new probes.
+
     Returns:
-        Dictionary with dependency names as keys and availability as boolean values
+        DependencyStatus with the availability of each dependency
     """
-    dependencies = {}
+    # The probes are independent and spend their time in stat calls and a
+    # subprocess, so running them in threads overlaps the waits
+    with ThreadPoolExecutor(max_workers=len(_DEPENDENCY_PROBES)) as executor:
+        futures = {name: executor.submit(probe) for name, probe in _DEPENDENCY_PROBES.items()}
+        return DependencyStatus(**{name: future.result() for name, future in futures.items()})
 
-    # Check Python packages
-    try:
-        import jupyter_client
-        dependencies['jupyter_client'] = True
-    except ImportError:
-        dependencies['jupyter_client'] = False
-
-    # Check for conda
-    dependencies['conda'] = bool(find_conda_path())
 
-    # Check for SysML kernel
-    dependencies['sysml_kernel'] = check_sysml_kernel()
+def check_dependencies_dict() -> Dict[str, bool]:
+    """
+    Check dependencies, returning the result as a dictionary.
 
-    # Check for graphviz executable
-    dependencies['graphviz'] = shutil.which('dot') is not None
+    Returns:
+        Dictionary with dependency names as keys and availability as boolean values
+    """
+    return asdict(check_dependencies())
 
-    # Check for PlantUML
-    dependencies['plantuml'] = check_plantuml()
 
-    return dependencies
+def _has_jupyter_client() -> bool:
+    """Return whether the jupyter_client package is installed, without importing it."""
+    # Importing jupyter_client pulls in zmq and tornado; locating it is enough here
+    return importlib.util.find_spec("jupyter_client") is not None
 
 
+@lru_cache(maxsize=1)
 def find_conda_path() -> Optional[str]:
-    """Find conda installation path."""
-    import platform
+    """
+    Find conda installation path.
 
+    The result is cached for the life of the process; call
+    invalidate_dependency_cache() to force a new lookup.
+    """
     # Check if conda is already in PATH first (most reliable)
     conda_executable = shutil.which("conda")
     if conda_executable:
         return str(Path(conda_executable).parent)
 
-    # Check common conda paths based on platform
-    possible_paths = []
+    # One which() over all common conda bin directories instead of stat'ing
+    # each directory and executable separately (which also handles PATHEXT on Windows)
+    conda_executable = shutil.which("conda", path=_CONDA_BIN_SEARCH_PATH)
+    if conda_executable:
+        return str(Path(conda_executable).parent)
+
+    return None
+
 
+# Conda installs in the user's home directory that have bin/ (Scripts/ on
+# Windows) and envs/ subdirectories
+_CONDA_USER_DIRS = ("miniconda", "anaconda", "miniforge", "mambaforge")
+# System-wide conda bin directories shared by Linux and macOS
+_POSIX_CONDA_BIN_DIRS = (
+    "/opt/conda/bin",
+    "/usr/local/conda/bin",
+    "/usr/local/miniconda/bin",
+    "/usr/local/anaconda/bin",
+)
+
+
+def _iter_conda_bin_dirs(system: str, home: str) -> Iterator[str]:
+    """Yield candidate conda bin directories for the platform."""
     # Cross-platform user directories
-    possible_paths.extend([
-        Path.home() / "miniconda" / "bin",
-        Path.home() / "anaconda" / "bin",
-        Path.home() / "miniforge" / "bin",
-        Path.home() / "mambaforge" / "bin",
-    ])
+    for name in _CONDA_USER_DIRS:
+        yield os.path.join(home, name, "bin")
 
     # Platform-specific system paths
-    system = platform.system().lower()
-    if system == "linux":
-        possible_paths.extend([
-            Path("/opt/conda/bin"),
-            Path("/usr/local/conda/bin"),
-            Path("/usr/local/miniconda/bin"),
-            Path("/usr/local/anaconda/bin")
-        ])
-    elif system == "darwin":  # macOS
-        possible_paths.extend([
-            Path("/opt/conda/bin"),
-            Path("/usr/local/conda/bin"),
-            Path("/usr/local/miniconda/bin"),
-            Path("/usr/local/anaconda/bin")
-        ])
+    if system in ("linux", "darwin"):
+        yield from _POSIX_CONDA_BIN_DIRS
     elif system == "windows":
         # Windows conda installations
-        possible_paths.extend([
-            Path.home() / "miniconda" / "Scripts",
-            Path.home() / "anaconda" / "Scripts",
-            Path.home() / "miniforge" / "Scripts",
-            Path.home() / "mambaforge" / "Scripts",
-        ])
-        # Add potential system-wide installations
-        for drive in ['C:', 'D:']:
-            possible_paths.extend([
-                Path(f"{drive}/miniconda/Scripts"),
-                Path(f"{drive}/anaconda/Scripts"),
-                Path(f"{drive}/ProgramData/miniconda/Scripts"),
-                Path(f"{drive}/ProgramData/anaconda/Scripts")
-            ])
-
-    for path in possible_paths:
-        conda_exe = "conda.exe" if system == "windows" else "conda"
-        if path.exists() and (path / conda_exe).exists():
-            return str(path)
+        for name in _CONDA_USER_DIRS:
+            yield os.path.join(home, name, "Scripts")
+        # Potential system-wide installations
+        for drive in ('C:', 'D:'):
+            yield f"{drive}/miniconda/Scripts"
+            yield f"{drive}/anaconda/Scripts"
+            yield f"{drive}/ProgramData/miniconda/Scripts"
+            yield f"{drive}/ProgramData/anaconda/Scripts"
 
-    return None
+
+# Candidate conda bin directories as a search path for shutil.which(); they
+# depend only on the platform and home directory, so are built once
+_CONDA_BIN_SEARCH_PATH = os.pathsep.join(_iter_conda_bin_dirs(_SYSTEM, _HOME))
 
 
+@lru_cache(maxsize=1)
 def find_jupyter_executable() -> Optional[str]:
-    """Find jupyter executable, checking both PATH and conda installations."""
-    import platform
+    """
+    Find jupyter executable, checking both PATH and conda installations.
 
+    The result is cached for the life of the process.
+    """
     # First check if jupyter is in PATH
     jupyter_exe = shutil.which("jupyter")
     if jupyter_exe:
         return jupyter_exe
 
-    # If not in PATH, check conda installations
+    # If not in PATH, check the conda installation and its environments
+    candidate_dirs = []
+
     conda_path = find_conda_path()
     if conda_path:
-        system = platform.system().lower()
-        jupyter_exe = "jupyter.exe" if system == "windows" else "jupyter"
-        jupyter_path = Path(conda_path) / jupyter_exe
-        if jupyter_path.exists():
-            return str(jupyter_path)
-
-    # Check common conda environment paths
-    possible_jupyter_paths = []
-    system = platform.system().lower()
-    jupyter_exe = "jupyter.exe" if system == "windows" else "jupyter"
+        candidate_dirs.append(conda_path)
 
     # Check user conda environments
-    conda_envs = [
-        Path.home() / "miniconda" / "envs",
-        Path.home() / "anaconda" / "envs",
-        Path.home() / "miniforge" / "envs",
-        Path.home() / "mambaforge" / "envs",
-    ]
-
-    for env_base in conda_envs:
-        if env_base.exists():
-            for env_dir in env_base.iterdir():
-                if env_dir.is_dir():
-                    bin_dir = env_dir / ("Scripts" if system == "windows" else "bin")
-                    jupyter_path = bin_dir / jupyter_exe
-                    if jupyter_path.exists():
-                        possible_jupyter_paths.append(str(jupyter_path))
+    bin_name = "Scripts" if _SYSTEM == "windows" else "bin"
+    for name in _CONDA_USER_DIRS:
+        # Listing the directory is the existence check; most bases are absent
+        try:
+            with os.scandir(os.path.join(_HOME, name, "envs")) as entries:
+                for entry in entries:
+                    # DirEntry.is_dir() uses the type from the directory listing
+                    if entry.is_dir():
+                        candidate_dirs.append(os.path.join(entry.path, bin_name))
+        except OSError:
+            continue
 
-    # Return first found jupyter executable
-    if possible_jupyter_paths:
-        return possible_jupyter_paths[0]
+    # Return the first jupyter found, searching the directories in order
+    if candidate_dirs:
+        return shutil.which("jupyter", path=os.pathsep.join(candidate_dirs))
 
     return None
 
 
+@lru_cache(maxsize=1)
 def find_system_kernel_paths() -> List[str]:
-    """Find common system kernel installation paths."""
-    import platform
-
-    potential_paths = []
-    system = platform.system().lower()
-
-    # Common conda installation paths
-    conda_bases = [
-        Path.home() / "miniconda",
-        Path.home() / "miniconda3",
-        Path.home() / "anaconda",
-        Path.home() / "anaconda3",
-        Path.home() / "miniforge",
-        Path.home() / "miniforge3",
-        Path.home() / "mambaforge",
-        Path.home() / "mambaforge3",
-        Path("/opt/conda"),
-        Path("/usr/local/conda"),
-        Path("/opt/miniconda"),
-        Path("/opt/miniconda3"),
-        Path("/opt/anaconda"),
-        Path("/opt/anaconda3"),
-        Path("/opt/miniforge"),
-        Path("/opt/miniforge3"),
-        Path("/opt/mambaforge"),
-        Path("/opt/mambaforge3"),
-    ]
+    """
+    Find common system kernel installation paths.
 
-    # Add system-wide paths
-    if system == "linux":
-        conda_bases.extend([
-            Path("/usr/share/miniconda"),
-            Path("/usr/share/anaconda"),
-            Path("/usr/local/miniconda"),
-            Path("/usr/local/anaconda"),
-        ])
-    elif system == "darwin":  # macOS
-        conda_bases.extend([
-            Path("/usr/local/miniconda"),
-            Path("/usr/local/anaconda"),
-            Path("/Applications/miniconda"),
-            Path("/Applications/anaconda"),
-        ])
-
-    # Also check for absolute paths like /miniforge3
-    absolute_conda_paths = [
-        Path("/miniforge3"),
-        Path("/miniconda3"),
-        Path("/anaconda3"),
-        Path("/opt/miniforge3"),
-        Path("/opt/miniconda3"),
-        Path("/opt/anaconda3"),
-    ]
-    conda_bases.extend(absolute_conda_paths)
+    The result is cached for the life of the process; treat the list as read-only.
+    """
+    potential_paths: List[str] = []
+    seen = set()
+
+    def add(path: str) -> None:
+        if path not in seen and os.path.exists(path):
+            seen.add(path)
+            potential_paths.append(path)
+
+    # Common conda installation paths, then system-wide and root-level ones
+    conda_bases = [os.path.join(_HOME, name) for name in _CONDA_BASE_HOME_DIRS]
+    conda_bases.extend(_CONDA_BASES_COMMON)
+    conda_bases.extend(_CONDA_BASES_BY_SYSTEM.get(_SYSTEM, ()))
+    conda_bases.extend(_CONDA_BASES_ROOT)
 
     # Look for jupyter kernel directories in each conda installation
     for conda_base in conda_bases:
-        if conda_base.exists():
-            kernel_path = conda_base / "share" / "jupyter"
-            if kernel_path.exists():
-                potential_paths.append(str(kernel_path))
+        if os.path.exists(conda_base):
+            add(os.path.join(conda_base, "share", "jupyter"))
 
     # Also use the conda path we already discovered via find_conda_path()
     conda_path = find_conda_path()
     if conda_path:
         # conda_path is like "/home/user/miniforge3/bin", we want "/home/user/miniforge3/share/jupyter"
-        conda_base = Path(conda_path).parent
-        kernel_path = conda_base / "share" / "jupyter"
-        if kernel_path.exists() and str(kernel_path) not in potential_paths:
-            potential_paths.append(str(kernel_path))
+        add(os.path.join(os.path.dirname(conda_path), "share", "jupyter"))
 
     # Also check user-level jupyter paths
-    user_jupyter_paths = [
-        Path.home() / ".local" / "share" / "jupyter",
-        Path.home() / ".jupyter",
-    ]
-
-    for user_path in user_jupyter_paths:
-        if user_path.exists():
-            potential_paths.append(str(user_path))
+    add(os.path.join(_HOME, ".local", "share", "jupyter"))
+    add(os.path.join(_HOME, ".jupyter"))
 
     return potential_paths
 
 
 def setup_jupyter_environment():
-    """Automatically set up JUPYTER_PATH to include system kernels."""
-    import os
+    """
+    Automatically set up JUPYTER_PATH to include system kernels.
+
+    Runs once per process; call invalidate_dependency_cache() to apply it again.
+    """
+    global _jupyter_env_setup_done
+    if _jupyter_env_setup_done:
+        return
+    _jupyter_env_setup_done = True
 
     system_paths = find_system_kernel_paths()
     if not system_paths:
@@ -248,32 +281,48 @@ def setup_jupyter_environment():
 
     # Get current JUPYTER_PATH
     current_path = os.environ.get('JUPYTER_PATH', '')
+    current_entries = current_path.split(os.pathsep) if current_path else []
 
     # Build new JUPYTER_PATH with system paths
-    new_paths = []
-    for path in system_paths:
-        if path not in current_path:
-            new_paths.append(path)
+    new_paths = [path for path in system_paths if path not in current_entries]
 
     if new_paths:
-        if current_path:
-            new_jupyter_path = ':'.join(new_paths) + ':' + current_path
-        else:
-            new_jupyter_path = ':'.join(new_paths)
-
-        os.environ['JUPYTER_PATH'] = new_jupyter_path
+        os.environ['JUPYTER_PATH'] = os.pathsep.join(new_paths + current_entries)
 
 
+@lru_cache(maxsize=1)
 def check_sysml_kernel() -> bool:
-    """Check if SysML kernel is installed using various jupyter paths and auto-setup."""
+    """
+    Check if SysML kernel is installed using various jupyter paths and auto-setup.
+
+    The result is cached for the life of the process. The kernelspec
+    subprocess is only run when jupyter_client is not importable here.
+    """
     # First, try to set up jupyter environment automatically
     setup_jupyter_environment()
 
+    # Kernelspecs are plain directories, so look for one before paying for
+    # a jupyter subprocess; the subprocess still covers nonstandard setups
+    if _find_sysml_kernelspec_dir():
+        return True
+
+    # jupyter_client resolves kernelspecs the same way `jupyter kernelspec
+    # list` does, so ask it in-process rather than starting an interpreter;
+    # JUPYTER_PATH already includes the conda locations found above
+    if _has_jupyter_client():
+        try:
+            from jupyter_client.kernelspec import KernelSpecManager
+            return any(map(_is_sysml_kernel_name, KernelSpecManager().find_kernel_specs()))
+        except (ImportError, OSError):
+            pass
+
     jupyter_paths = []
 
-    # Try jupyter in PATH first
-    if shutil.which("jupyter"):
-        jupyter_paths.append("jupyter")
+    # Try jupyter in PATH first; the absolute path lets subprocess use
+    # posix_spawn (see _kernelspec_list)
+    jupyter_in_path = shutil.which("jupyter")
+    if jupyter_in_path:
+        jupyter_paths.append(jupyter_in_path)
 
     # Try finding jupyter in conda installations
     jupyter_exe = find_jupyter_executable()
@@ -282,30 +331,113 @@ def check_sysml_kernel() -> bool:
 
     # Try each jupyter executable
     for jupyter_path in jupyter_paths:
+        result, _ = _kernelspec_list(jupyter_path)
+        if result is None or result.returncode != 0:
+            continue
         try:
-            result = subprocess.run(
-                [jupyter_path, "kernelspec", "list"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0 and "sysml" in result.stdout:
+            if any(map(_is_sysml_kernel_name, _parse_kernelspecs(result.stdout))):
                 return True
-        except (subprocess.SubprocessError, FileNotFoundError, PermissionError):
+        except ValueError:
             continue
 
     return False
 
 
+def _find_sysml_kernelspec_dir() -> Optional[str]:
+    """
+    Look for an installed SysML kernelspec without running jupyter.
+
+    Searches the kernels/ directory of the known Jupyter data directories
+    (system and conda installs, this Python's prefix and JUPYTER_PATH).
+
+    Returns:
+        Path of the first kernelspec directory whose name contains "sysml", or None
+    """
+    data_dirs = list(find_system_kernel_paths())
+    data_dirs.append(os.path.join(sys.prefix, "share", "jupyter"))
+    data_dirs.extend(path for path in os.environ.get('JUPYTER_PATH', '').split(os.pathsep) if path)
+
+    for data_dir in data_dirs:
+        try:
+            with os.scandir(os.path.join(data_dir, "kernels")) as entries:
+                for entry in entries:
+                    if "sysml" in entry.name.lower() and os.path.isfile(os.path.join(entry.path, "kernel.json")):
+                        return entry.path
+        except OSError:
+            continue
+
+    return None
+
+
+@lru_cache(maxsize=8)
+def _kernelspec_list(jupyter_path: str) -> Tuple[Optional[subprocess.CompletedProcess], Optional[Exception]]:
+    """
+    Run `jupyter kernelspec list --json` with the given executable, once per process.
+
+    jupyter_path should be absolute: CPython only uses posix_spawn for an
+    executable given with a directory, and otherwise falls back to fork+exec
+    whatever close_fds is.
+
+    Shared by check_sysml_kernel() and get_kernel_diagnostics() so the
+    subprocess is not spawned twice for the same executable. The output is
+    left as bytes for _parse_kernelspecs().
+
+    Returns:
+        Tuple of (completed process, None), or (None, exception) if it could not be run
+    """
+    try:
+        result = subprocess.run(
+            [jupyter_path, "kernelspec", "list", "--json"],
+            capture_output=True,
+            timeout=10,
+            close_fds=False  # Lets CPython use posix_spawn instead of fork+exec
+        )
+    except (subprocess.SubprocessError, OSError) as e:
+        return None, e
+    return result, None
+
+
+def _parse_kernelspecs(output: bytes) -> Dict[str, str]:
+    """
+    Parse the output of `jupyter kernelspec list --json`.
+
+    Args:
+        output: Raw stdout of the command
+
+    Returns:
+        Dictionary mapping kernel names to their resource directories
+
+    Raises:
+        ValueError: If the output is not the expected JSON document
+    """
+    document = json.loads(output)
+    kernelspecs = document.get("kernelspecs") if isinstance(document, dict) else None
+    if not isinstance(kernelspecs, dict):
+        raise ValueError("no 'kernelspecs' object in kernelspec list output")
+    return {
+        name: spec.get("resource_dir", "") if isinstance(spec, dict) else ""
+        for name, spec in kernelspecs.items()
+    }
+
+
+def _is_sysml_kernel_name(name: str) -> bool:
+    """Return whether a kernelspec name refers to a SysML kernel."""
+    return "sysml" in name.lower()
+
+
+@lru_cache(maxsize=1)
 def get_kernel_diagnostics() -> Dict[str, any]:
-    """Get detailed diagnostics about kernel detection."""
-    import os
+    """
+    Get detailed diagnostics about kernel detection.
 
+    The result is cached for the life of the process; treat it as read-only.
+    """
     # Set up jupyter environment first
     setup_jupyter_environment()
 
+    jupyter_in_path = shutil.which("jupyter")
     diagnostics = {
-        'jupyter_in_path': shutil.which("jupyter") is not None,
+        'jupyter_in_path': jupyter_in_path is not None,
         'jupyter_executable': find_jupyter_executable(),
         'conda_path': find_conda_path(),
         'system_kernel_paths': find_system_kernel_paths(),
@@ -316,107 +448,162 @@ def get_kernel_diagnostics() -> Dict[str, any]:
     }
 
     jupyter_paths = []
-    if diagnostics['jupyter_in_path']:
-        jupyter_paths.append("jupyter")
-    if diagnostics['jupyter_executable']:
+    if jupyter_in_path:
+        jupyter_paths.append(jupyter_in_path)
+    if diagnostics['jupyter_executable'] and diagnostics['jupyter_executable'] not in jupyter_paths:
         jupyter_paths.append(diagnostics['jupyter_executable'])
 
     for jupyter_path in jupyter_paths:
-        try:
-            result = subprocess.run(
-                [jupyter_path, "kernelspec", "list"],
-                capture_output=True,
-                text=True,
-                timeout=10
+        result, error = _kernelspec_list(jupyter_path)
+        if error is not None:
+            diagnostics['error_messages'].append(f"Exception with {jupyter_path}: {str(error)}")
+        elif result.returncode == 0:
+            try:
+                kernelspecs = _parse_kernelspecs(result.stdout)
+            except ValueError as e:
+                diagnostics['error_messages'].append(f"Unreadable kernel list from {jupyter_path}: {e}")
+                continue
+            # Same layout as the plain `jupyter kernelspec list` listing
+            diagnostics['kernel_list_output'] = "Available kernels:\n" + "".join(
+                f"  {name}    {resource_dir}\n" for name, resource_dir in sorted(kernelspecs.items())
             )
-            if result.returncode == 0:
-                diagnostics['kernel_list_output'] = result.stdout
-                if "sysml" in result.stdout:
-                    diagnostics['sysml_kernel_found'] = True
-                    break
-            else:
-                diagnostics['error_messages'].append(f"Error with {jupyter_path}: {result.stderr}")
-        except Exception as e:
-            diagnostics['error_messages'].append(f"Exception with {jupyter_path}: {str(e)}")
+            if any(map(_is_sysml_kernel_name, kernelspecs)):
+                diagnostics['sysml_kernel_found'] = True
+                break
+        else:
+            diagnostics['error_messages'].append(f"Error with {jupyter_path}: {result.stderr.decode('utf-8', errors='replace')}")
 
     return diagnostics
 
 
+@lru_cache(maxsize=1)
 def check_plantuml() -> bool:
-    """Check if PlantUML is available."""
-    import platform
+    """
+    Check if PlantUML is available.
 
+    The result is cached for the life of the process; call
+    invalidate_dependency_cache() to force a new lookup.
+    """
     # Check for plantuml command in PATH first (most reliable)
     if shutil.which('plantuml'):
         return True
 
-    # Check for plantuml.jar in common locations based on platform
-    possible_paths = []
+    # Check for plantuml.jar in the current working directory, which may
+    # change, then in the platform's common locations
+    if os.path.exists(os.path.join(os.getcwd(), "plantuml.jar")):
+        return True
 
-    # Current working directory (universal)
-    possible_paths.append(Path.cwd() / "plantuml.jar")
+    if any(os.path.exists(path) for path in _PLANTUML_CANDIDATES):
+        return True
 
-    # Platform-specific paths
-    system = platform.system().lower()
-    if system == "linux":
-        possible_paths.extend([
-            Path("/usr/share/plantuml/plantuml.jar"),
-            Path("/opt/plantuml/plantuml.jar"),
-            Path("/usr/local/share/plantuml/plantuml.jar"),
-            Path("/usr/local/plantuml/plantuml.jar")
-        ])
-    elif system == "darwin":  # macOS
-        possible_paths.extend([
-            Path("/usr/local/share/plantuml/plantuml.jar"),
-            Path("/opt/plantuml/plantuml.jar"),
-            Path("/usr/local/plantuml/plantuml.jar"),
-            # Homebrew locations
-            Path("/usr/local/Cellar/plantuml"),  # Will need to check subdirs
-            Path("/opt/homebrew/Cellar/plantuml")  # Apple Silicon
-        ])
-    elif system == "windows":
-        # Common Windows installation directories
-        for drive in ['C:', 'D:']:
-            possible_paths.extend([
-                Path(f"{drive}/plantuml/plantuml.jar"),
-                Path(f"{drive}/Program Files/plantuml/plantuml.jar"),
-                Path(f"{drive}/Program Files (x86)/plantuml/plantuml.jar")
-            ])
-
-    # Check each path
-    for path in possible_paths:
-        if path.exists():
-            return True
-        # For directories like Homebrew Cellar, check for plantuml.jar in subdirectories
-        if path.is_dir() and "Cellar" in str(path):
-            for jar_file in path.rglob("plantuml.jar"):
-                if jar_file.exists():
-                    return True
+    # An installed but unlinked Homebrew formula has no opt/ symlink; its jar
+    # is at Cellar/plantuml/<version>/libexec/plantuml.jar
+    if _SYSTEM == "darwin":
+        for cellar in ("/usr/local/Cellar/plantuml", "/opt/homebrew/Cellar/plantuml"):
+            try:
+                with os.scandir(cellar) as versions:
+                    if any(os.path.isfile(os.path.join(version.path, "libexec", "plantuml.jar"))
+                           for version in versions):
+                        return True
+            except OSError:
+                continue
 
     return False
 
 
-def validate_method_dependencies(method: str) -> List[str]:
+# plantuml.jar locations shared by Linux and macOS
+_POSIX_PLANTUML_JARS = (
+    "/opt/plantuml/plantuml.jar",
+    "/usr/local/share/plantuml/plantuml.jar",
+    "/usr/local/plantuml/plantuml.jar",
+)
+
+
+def _iter_plantuml_candidates(system: str) -> Iterator[str]:
+    """Yield candidate plantuml.jar locations for the platform."""
+    if system == "linux":
+        yield "/usr/share/plantuml/plantuml.jar"  # Distribution packages
+        yield from _POSIX_PLANTUML_JARS
+    elif system == "darwin":  # macOS
+        yield from _POSIX_PLANTUML_JARS
+        # Homebrew links the active version's jar under <prefix>/opt
+        yield "/usr/local/opt/plantuml/libexec/plantuml.jar"
+        yield "/opt/homebrew/opt/plantuml/libexec/plantuml.jar"  # Apple Silicon
+    elif system == "windows":
+        # Common Windows installation directories
+        for drive in ('C:', 'D:'):
+            yield f"{drive}/plantuml/plantuml.jar"
+            yield f"{drive}/Program Files/plantuml/plantuml.jar"
+            yield f"{drive}/Program Files (x86)/plantuml/plantuml.jar"
+
+
+# Common plantuml.jar locations for this platform, built once
+_PLANTUML_CANDIDATES = tuple(_iter_plantuml_candidates(_SYSTEM))
+
+
+def invalidate_dependency_cache() -> None:
+    """Clear all cached dependency probes, e.g. after installing a dependency."""
+    global _jupyter_env_setup_done
+
+    for probe in (
+        check_dependencies,
+        find_conda_path,
+        find_jupyter_executable,
+        find_system_kernel_paths,
+        check_sysml_kernel,
+        _kernelspec_list,
+        get_kernel_diagnostics,
+        check_plantuml,
+        validate_method_dependencies,
+        _sysml_kernel_fingerprint,
+    ):
+        probe.cache_clear()
+    _jupyter_env_setup_done = False
+
+
+# Probe for each dependency, keyed by DependencyStatus field name
+_DEPENDENCY_PROBES = {
+    # Python packages
+    'jupyter_client': _has_jupyter_client,
+    'conda': lambda: bool(find_conda_path()),
+    # May run `jupyter kernelspec list`, the slowest probe
+    'sysml_kernel': check_sysml_kernel,
+    # Graphviz executable
+    'graphviz': lambda: shutil.which('dot') is not None,
+    'plantuml': check_plantuml,
+}
+
+# Dependencies each visualization method needs, and how to install them
+_METHOD_DEPENDENCIES = {
+    "kernel-api": ("jupyter_client", "sysml_kernel"),
+}
+_INSTALL_HINTS = {
+    "jupyter_client": ("Install Jupyter Client:", "pip install jupyter-client"),
+    "sysml_kernel": ("Install SysML Kernel:", "conda install -c conda-forge jupyter-sysml-kernel"),
+}
+
+
+@lru_cache(maxsize=None)
+def validate_method_dependencies(method: str) -> Tuple[str, ...]:
     """
     Validate dependencies for a specific visualization method.
 
+    The installed environment does not change during a process, so results
+    are cached per method.
+
     Args:
         method: Visualization method name
 
     Returns:
-        List of missing dependencies (empty if all satisfied)
+        Tuple of missing dependency names, as in DependencyStatus (empty if all satisfied)
     """
-    deps = check_dependencies()
-    missing = []
-
-    if method == "kernel-api":
-        if not deps['jupyter_client']:
-            missing.append("jupyter_client (pip install jupyter-client)")
-        if not deps['sysml_kernel']:
-            missing.append("SysML kernel (conda install -c conda-forge jupyter-sysml-kernel)")
-
-
-    return missing
+    # Run only the probes this method needs rather than check_dependencies(),
+    # which also looks for conda, Graphviz and PlantUML
+    return tuple(
+        name
+        for name in _METHOD_DEPENDENCIES.get(method, ())
+        if not _DEPENDENCY_PROBES[name]()
+    )
 
 
 def print_dependency_status():
@@ -429,12 +616,12 @@ def print_dependency_status():
 
     # Core dependencies
     print("Core Dependencies:")
-    status = "✅" if deps['jupyter_client'] else "❌"
+    status = "✅" if deps.jupyter_client else "❌"
     print(f"  {status} jupyter_client")
 
     # Kernel dependencies with enhanced diagnostics
     print("\nKernel Method Dependencies:")
-    status = "✅" if deps['conda'] else "❌"
+    status = "✅" if deps.conda else "❌"
     conda_path = diagnostics['conda_path']
     if conda_path:
         print(f"  {status} conda (found at: {conda_path})")
@@ -450,11 +637,11 @@ def print_dependency_status():
             print(f"      ℹ️  jupyter found at: {diagnostics['jupyter_executable']}")
 
     # SysML kernel status with detailed diagnostics
-    status = "✅" if deps['sysml_kernel'] else "❌"
+    status = "✅" if deps.sysml_kernel else "❌"
     print(f"  {status} sysml kernel")
 
     # If kernel not found, provide detailed diagnostics
-    if not deps['sysml_kernel']:
+    if not deps.sysml_kernel:
         print("\n🔍 Kernel Diagnostics:")
         if not diagnostics['jupyter_executable'] and not diagnostics['jupyter_in_path']:
             print("  ❌ No jupyter executable found")
@@ -480,7 +667,7 @@ def print_dependency_status():
 
     # Recommendations with enhanced suggestions
     available_methods = []
-    if deps['jupyter_client'] and deps['sysml_kernel']:
+    if deps.jupyter_client and deps.sysml_kernel:
         available_methods.append("kernel-api")
 
     if available_methods:
@@ -489,13 +676,13 @@ def print_dependency_status():
         print("❌ No visualization methods available.")
         print("\n💡 Troubleshooting suggestions:")
 
-        if not deps['conda']:
+        if not deps.conda:
             print("  1. Install conda/miniconda:")
             print("     curl -L -O https://github.com/conda-forge/miniforge/releases/latest/download/Miniforge3-$(uname)-$(uname -m).sh")
             print("     bash Miniforge3-$(uname)-$(uname -m).sh")
 
-        if not deps['sysml_kernel']:
-            if deps['conda'] or conda_path:
+        if not deps.sysml_kernel:
+            if deps.conda or conda_path:
                 print("  2. Install SysML kernel:")
                 print("     conda install -c conda-forge jupyter-sysml-kernel")
                 if conda_path and not diagnostics['jupyter_in_path']:
@@ -529,40 +716,191 @@ def suggest_installation_commands(method: str) -> str:
         ""
     ]
 
-    if "jupyter_client" in str(missing):
-        suggestions.extend([
-            "Install Jupyter Client:",
-            "  pip install jupyter-client",
-            ""
-        ])
+    for name in missing:
+        title, command = _INSTALL_HINTS[name]
+        suggestions.extend([title, f"  {command}", ""])
 
-    if "SysML kernel" in str(missing):
-        suggestions.extend([
-            "Install SysML Kernel:",
-            "  conda install -c conda-forge jupyter-sysml-kernel",
-            ""
-        ])
+    return "\n".join(suggestions)
 
 
-    return "\n".join(suggestions)
+# Output directories already created by ensure_output_directory()
+_created_dirs: Set[str] = set()
 
 
 def ensure_output_directory(output_path: str) -> None:
     """Ensure output directory exists."""
-    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    directory = os.path.dirname(output_path)
+    if directory and directory not in _created_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _created_dirs.add(directory)
+
 
+# Directory names never descended into when discovering .sysml files, in
+# addition to hidden directories such as .git
+SYSML_SCAN_EXCLUDES = frozenset({"node_modules", "__pycache__", "venv", "site-packages", "build", "dist"})
 
-def find_sysml_files() -> List[str]:
+
+def _scan_sysml_files(root: str, excludes: FrozenSet[str]) -> Iterator[str]:
+    """Yield .sysml file paths below root, pruning hidden and excluded directories."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    # DirEntry caches its type, so these checks avoid extra stat calls
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith(".") and entry.name not in excludes:
+                            stack.append(entry.path)
+                    elif _SYSML_FILE_RE.search(entry.name) and entry.is_file():
+                        yield entry.path
+        except OSError:
+            # Unreadable, or removed since it was listed
+            pass
+
+
+def find_sysml_files(root: Optional[str] = None, exclude: Optional[List[str]] = None) -> List[str]:
     """
-    Find all .sysml files in the current directory and subdirectories.
+    Find all .sysml files in a directory tree.
+
+    The extension is matched case-insensitively. Hidden directories and those named in SYSML_SCAN_EXCLUDES are skipped.
+
+    Args:
+        root: Directory to search, defaults to the current directory
+        exclude: Additional directory names to skip
 
     Returns:
         List of absolute paths to .sysml files
     """
-    sysml_files = []
-    for sysml_file in Path.cwd().rglob("*.sysml"):
-        sysml_files.append(str(sysml_file.absolute()))
-    return sorted(sysml_files)
+    excludes = SYSML_SCAN_EXCLUDES.union(exclude) if exclude else SYSML_SCAN_EXCLUDES
+    return sorted(_scan_sysml_files(os.path.abspath(root) if root else os.getcwd(), excludes))
+
+
+@lru_cache(maxsize=None)
+def _read_sysml_index_entry(file_path: str, mtime_ns: int, size: int) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """
+    Extract declared and referenced package names from a SysML file.
+
+    The modification time and size are part of the cache key, so an edited
+    file is re-read while unchanged files are served from the cache.
+
+    Returns:
+        Tuple of (declared package names, all names used in the file)
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        content = f.read()
+    # Strip comments and strings once so neither the scans below nor
+    # mentions like "// package Foo" produce spurious matches
+    content = _STRING_OR_COMMENT_RE.sub(" ", content)
+    declared = frozenset(map(_unquote_name, _PACKAGE_DECLARATION_RE.findall(content)))
+    referenced = frozenset(map(_unquote_name, _SYSML_NAME_RE.findall(content)))
+    return declared, referenced
+
+
+def _unquote_name(name: str) -> str:
+    """Strip the quotes from a quoted SysML name, so 'Vehicle' and Vehicle compare equal."""
+    if len(name) >= 2 and name[0] == name[-1] == "'":
+        return name[1:-1]
+    return name
+
+
+def scan_sysml_index(file_paths: List[str]) -> Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]:
+    """
+    Build a package index for SysML files.
+
+    Args:
+        file_paths: List of paths to SysML files
+
+    Returns:
+        Dictionary mapping each readable file path to a tuple of
+        (declared package names, all names used in the file)
+    """
+    index = {}
+    for file_path in file_paths:
+        try:
+            stat = os.stat(file_path)
+            index[file_path] = _read_sysml_index_entry(file_path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            continue
+    return index
+
+
+def select_sysml_files_for_element(file_paths: List[str], elements: List[str]) -> List[str]:
+    """
+    Restrict SysML files to those needed to visualize the given elements.
+
+    Files declaring the element's top-level package are selected, together
+    with every file declaring a package they mention (transitively), so
+    imports and aliases between files keep resolving. Any name equal to a
+    declared package counts, qualified ("Parts::Engine") or bare ("Parts"). Files that declare no package
+    contribute to the root namespace and are always kept. If any requested
+    package is not declared in the index, all files are returned unchanged.
+
+    Args:
+        file_paths: List of paths to SysML files
+        elements: Element targets, e.g. ['Package::Element', "'Vehicle Model'::Engine"]
+
+    Returns:
+        List of file paths to combine, in the original order
+    """
+    index = scan_sysml_index(file_paths)
+
+    files_by_package: Dict[str, List[str]] = {}
+    for file_path, (declared, _) in index.items():
+        for package_name in declared:
+            files_by_package.setdefault(package_name, []).append(file_path)
+
+    pending = []
+    for target in elements:
+        match = _TARGET_PACKAGE_RE.match(target)
+        if not match:
+            return list(file_paths)
+        pending.append(_unquote_name(match.group(1)))
+    if not pending or any(name not in files_by_package for name in pending):
+        return list(file_paths)
+
+    selected = {file_path for file_path, (declared, _) in index.items() if not declared}
+    for file_path in selected:
+        pending.extend(index[file_path][1])
+
+    seen_packages = set()
+    while pending:
+        package_name = pending.pop()
+        if package_name in seen_packages:
+            continue
+        seen_packages.add(package_name)
+        for file_path in files_by_package.get(package_name, ()):
+            if file_path not in selected:
+                selected.add(file_path)
+                pending.extend(index[file_path][1])
+
+    return [file_path for file_path in file_paths if file_path in selected]
+
+
+def _read_sysml_bytes(file_path: str) -> Tuple[str, Optional[bytes], Optional[OSError]]:
+    """Read a file for combine_sysml_files, returning (path, data, error)."""
+    try:
+        with open(file_path, 'rb') as f:
+            return file_path, f.read(), None
+    except OSError as e:
+        return file_path, None, e
+
+
+def _write_combined_sysml(
+    results: Iterable[Tuple[str, Optional[bytes], Optional[OSError]]],
+    out: BinaryIO
+) -> None:
+    """Write read files, each under a "// From file:" header, into a binary file object."""
+    first = True
+    for file_path, data, error in results:
+        if error is not None:
+            print(f"Warning: Could not read {file_path}: {error}")
+            continue
+        if not first:
+            out.write(b"\n")  # Add blank line between files
+        out.write(f"// From file: {file_path}\n".encode('utf-8'))
+        out.write(data)
+        out.write(b"\n")
+        first = False
 
 
 def combine_sysml_files(file_paths: List[str]) -> str:
@@ -575,17 +913,160 @@ def combine_sysml_files(file_paths: List[str]) -> str:
     Returns:
         Combined SysML content
     """
-    combined_content = []
-    for file_path in file_paths:
+    # Reads are I/O bound, so overlap them (notably on network filesystems);
+    # map() keeps the results in file order
+    with ThreadPoolExecutor(max_workers=min(8, len(file_paths)) or 1) as executor:
+        results = executor.map(_read_sysml_bytes, file_paths)
+
+        # Accumulate raw bytes and decode once at the end rather than
+        # decoding every file and joining a list of strings
+        buffer = io.BytesIO()
+        _write_combined_sysml(results, buffer)
+    return str(buffer.getbuffer(), 'utf-8', 'replace')
+
+
+def write_file_atomic(path: str, data: bytes) -> None:
+    """
+    Write data to path atomically.
+
+    The bytes are written to a temporary file next to path which is then
+    renamed over it, so readers and concurrent runs never see a partial file.
+
+    Args:
+        path: Destination file path
+        data: Bytes to write
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    try:
+        fd = os.open(temp_path, flags, 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(temp_path, path)
+    except BaseException:
         try:
-            content = Path(file_path).read_text(encoding='utf-8')
-            combined_content.append(f"// From file: {file_path}")
-            combined_content.append(content)
-            combined_content.append("")  # Add blank line between files
-        except Exception as e:
-            print(f"Warning: Could not read {file_path}: {e}")
-
-    return "\n".join(combined_content)
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def get_cache_dir(cache_dir: Optional[str] = None) -> Path:
+    """
+    Return the directory used to cache rendered SVGs.
+
+    Args:
+        cache_dir: Explicit cache directory; defaults to the user cache dir
+
+    Returns:
+        Path of the SVG cache directory
+    """
+    if cache_dir:
+        return Path(cache_dir)
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(_HOME, ".cache")
+    return Path(cache_home) / "sysml-visualizer"
+
+
+def svg_cache_key(
+    sysml_content: str,
+    view: Optional[str] = None,
+    style: Optional[str] = None,
+    element: Optional[str] = None
+) -> str:
+    """
+    Compute the cache key for a rendering of SysML content.
+
+    The key also covers this package's version and the installed SysML
+    kernel, so upgrading either one stops older renderings being served.
+
+    Args:
+        sysml_content: SysML content to visualize
+        view: Visualization view type
+        style: Visualization style
+        element: Specific element to visualize
+
+    Returns:
+        Hex digest identifying the content and rendering options
+    """
+    from . import __version__
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{__version__}|{_sysml_kernel_fingerprint()}|".encode('utf-8'))
+    digest.update(f"{view}|{style}|{element}|".encode('utf-8'))
+    digest.update(sysml_content.encode('utf-8'))
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _sysml_kernel_fingerprint() -> str:
+    """
+    Identify the installed SysML kernel for svg_cache_key().
+
+    Lists the kernelspec's files (kernel.json and the kernel jar, whose name
+    carries the version) with their sizes and modification times and hashes
+    kernel.json, so upgrading or reinstalling the kernel changes the result.
+
+    Returns:
+        Fingerprint string, empty if no SysML kernelspec was found
+    """
+    setup_jupyter_environment()
+    spec_dir = _find_sysml_kernelspec_dir()
+    if spec_dir is None:
+        return ""
+
+    parts = [spec_dir]
+    try:
+        with os.scandir(spec_dir) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                stat = entry.stat()
+                parts.append(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}")
+        # kernel.json may point at a jar outside the kernelspec directory
+        with open(os.path.join(spec_dir, "kernel.json"), 'rb') as f:
+            parts.append(hashlib.blake2b(f.read(), digest_size=16).hexdigest())
+    except OSError:
+        pass
+    return "|".join(parts)
+
+
+def load_cached_svg(key: str, output_file: str, cache_dir: Optional[str] = None) -> bool:
+    """
+    Copy a cached SVG to output_file if one exists for key.
+
+    Args:
+        key: Cache key from svg_cache_key()
+        output_file: Path to copy the cached SVG to
+        cache_dir: Cache directory (see get_cache_dir)
+
+    Returns:
+        True if the cached SVG was copied, False on a cache miss
+    """
+    cached_path = get_cache_dir(cache_dir) / f"{key}.svg"
+    try:
+        shutil.copyfile(cached_path, output_file)
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        # An unreadable cache entry is a miss, not a failed render
+        print(f"Warning: Could not read cached SVG {cached_path}: {e}")
+        return False
+    return True
+
+
+def store_cached_svg(key: str, svg_file: str, cache_dir: Optional[str] = None) -> None:
+    """Store a rendered SVG in the cache (see get_cache_dir) under key."""
+    cache_dir = get_cache_dir(cache_dir)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Copy next to the final name and rename so readers never see a partial file
+        temp_path = cache_dir / f"{key}.svg.{os.getpid()}.tmp"
+        shutil.copyfile(svg_file, temp_path)
+        os.replace(temp_path, cache_dir / f"{key}.svg")
+    except OSError as e:
+        print(f"Warning: Could not cache {svg_file}: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+"""Shared fixtures: an in-process fake of jupyter_client and the SysML kernel."""
+
+import itertools
+import queue
+import re
+import sys
+import types
+
+import pytest
+
+
+class FakeClient:
+    """Kernel client replying to SysML code and %viz like the SysML kernel."""
+
+    _ids = itertools.count()
+
+    def __init__(self, executed, failing_views, ready):
+        self.executed = executed
+        self.failing_views = failing_views
+        self.ready = ready
+        self.iopub = queue.Queue()
+
+    def start_channels(self):
+        pass
+
+    def stop_channels(self):
+        pass
+
+    def wait_for_ready(self, timeout=None):
+        if not self.ready:
+            raise RuntimeError("Kernel didn't respond")
+
+    def execute(self, code):
+        msg_id = f"msg-{next(self._ids)}"
+        self.executed.append(code)
+        parent = {'msg_id': msg_id}
+        # Output of an unrelated request must be ignored
+        self._put({'msg_id': 'other'}, 'stream', {'name': 'stdout', 'text': 'noise'})
+        if code.startswith('%viz'):
+            view = re.search(r'--view (\w+)', code).group(1)
+            if view not in self.failing_views:
+                svg = f"<svg>{view} {code.split()[-1]}</svg>"
+                self._put(parent, 'display_data', {'data': {'image/svg+xml': svg}, 'metadata': {}})
+        else:
+            package = re.search(r'package (\w+)', code).group(1)
+            self._put(parent, 'stream', {'name': 'stdout', 'text': 'ok'})
+            self._put(parent, 'execute_result', {'data': {'text/plain': f"Package {package} (1234)"}})
+        self._put(parent, 'status', {'execution_state': 'idle'})
+        return msg_id
+
+    def get_iopub_msg(self, timeout=None):
+        return self.iopub.get_nowait()
+
+    def _put(self, parent, msg_type, content):
+        self.iopub.put({'parent_header': parent, 'msg_type': msg_type, 'content': content})
+
+
+class FakeAsyncClient(FakeClient):
+    async def wait_for_ready(self, timeout=None):
+        FakeClient.wait_for_ready(self, timeout)
+
+    async def get_iopub_msg(self, timeout=None):
+        return self.iopub.get_nowait()
+
+
+@pytest.fixture
+def kernel(monkeypatch):
+    """
+    Install a fake jupyter_client and return its record of executed code.
+
+    Views in record.failing_views produce no SVG, and record.unready_starts
+    kernels started first never become ready.
+    """
+    record = types.SimpleNamespace(executed=[], failing_views=set(), unready_starts=0, shutdowns=0)
+
+    class FakeKernelManager:
+        client_class = FakeClient
+
+        def __init__(self, kernel_name=None):
+            self.alive = False
+            self.ready = True
+
+        def start_kernel(self):
+            self.alive = True
+            if record.unready_starts:
+                record.unready_starts -= 1
+                self.ready = False
+
+        def client(self):
+            return self.client_class(record.executed, record.failing_views, self.ready)
+
+        def is_alive(self):
+            return self.alive
+
+        def shutdown_kernel(self):
+            self.alive = False
+            record.shutdowns += 1
+
+    class FakeAsyncKernelManager(FakeKernelManager):
+        client_class = FakeAsyncClient
+
+        async def start_kernel(self):
+            FakeKernelManager.start_kernel(self)
+
+        async def is_alive(self):
+            return self.alive
+
+        async def shutdown_kernel(self):
+            FakeKernelManager.shutdown_kernel(self)
+
+    fake_module = types.ModuleType('jupyter_client')
+    fake_module.KernelManager = FakeKernelManager
+    fake_module.AsyncKernelManager = FakeAsyncKernelManager
+    monkeypatch.setitem(sys.modules, 'jupyter_client', fake_module)
+    return record
@@ -0,0 +1,110 @@
+"""Tests for the command line interface against the fake SysML kernel."""
+
+import sys
+
+import pytest
+
+from sysml_v2_visualizer import cli, utils
+
+MODEL = "package Parts { part def Engine; }\npackage Vehicle { part car; }\n"
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch, kernel):
+    """Run in a directory holding a small model, with dependencies reported present."""
+    (tmp_path / 'model.sysml').write_text(MODEL)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(utils, 'validate_method_dependencies', lambda method: ())
+    monkeypatch.setattr(utils, '_sysml_kernel_fingerprint', lambda: "")
+    # Output directories are remembered by relative path, which differs per test
+    monkeypatch.setattr(utils, '_created_dirs', set())
+    return tmp_path
+
+
+def run_main(monkeypatch, *args):
+    """Run cli.main() with args and return its exit code."""
+    monkeypatch.setattr(sys, 'argv', ['sysml-visualize', *args])
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    return exit_info.value.code
+
+
+def test_element_placeholder_creates_each_directory(project, monkeypatch):
+    code = run_main(monkeypatch, 'out/{element}/diagram.svg', '--elements', 'Parts::Engine,Vehicle', '--no-cache')
+
+    assert code == 0
+    assert (project / 'out' / 'Parts_Engine' / 'diagram.svg').read_text() == '<svg>Tree Parts::Engine</svg>'
+    assert (project / 'out' / 'Vehicle' / 'diagram.svg').exists()
+    assert not (project / 'out' / '{element}').exists()
+
+
+def test_single_element_placeholder_creates_directory(project, monkeypatch):
+    code = run_main(monkeypatch, 'out/{element}/diagram.svg', '--element', 'Vehicle', '--no-cache')
+
+    assert code == 0
+    assert (project / 'out' / 'Vehicle' / 'diagram.svg').read_text() == '<svg>Tree Vehicle</svg>'
+    assert not (project / 'out' / '{element}').exists()
+
+
+@pytest.mark.parametrize('output_file, element, expected', [
+    ('out.svg', 'Parts::Engine', 'out_Parts_Engine.svg'),
+    ('diagrams/out', 'Vehicle', 'diagrams/out_Vehicle.svg'),
+    ('diagrams/{element}.svg', "'Vehicle Model'::Engine", 'diagrams/Vehicle_Model_Engine.svg'),
+])
+def test_element_output_path(output_file, element, expected):
+    assert cli.element_output_path(output_file, element) == expected
+
+
+def test_sniff_fast_path_answers_version(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli._sniff_fast_path(['out.svg', '--version'])
+
+    assert exit_info.value.code == 0
+    assert capsys.readouterr().out.strip() == cli.VERSION_STRING
+
+
+def test_sniff_fast_path_leaves_other_arguments_to_the_parser(capsys):
+    assert cli._sniff_fast_path(['out.svg', '--element', 'Parts']) is None
+    assert capsys.readouterr().out == ""
+
+
+def test_element_and_elements_options_are_merged(project, monkeypatch, kernel):
+    code = run_main(monkeypatch, 'out.svg', '--element', 'Parts::Engine', '--elements', ' Vehicle, ,', '--no-cache')
+
+    assert code == 0
+    assert kernel.executed.count('%viz --view Tree Parts::Engine') == 1
+    assert (project / 'out_Parts_Engine.svg').read_text() == '<svg>Tree Parts::Engine</svg>'
+    assert (project / 'out_Vehicle.svg').read_text() == '<svg>Tree Vehicle</svg>'
+
+
+def test_visualize_elements_reuses_cached_svgs(project, kernel):
+    cache_dir = str(project / 'cache')
+    elements = ['Parts::Engine', 'Vehicle']
+
+    assert cli.visualize_elements('out.svg', elements, cache_dir=cache_dir)
+    executed = len(kernel.executed)
+    (project / 'out_Vehicle.svg').unlink()
+
+    assert cli.visualize_elements('out.svg', elements, cache_dir=cache_dir)
+    assert len(kernel.executed) == executed
+    assert (project / 'out_Vehicle.svg').read_text() == '<svg>Tree Vehicle</svg>'
+
+
+def test_visualize_elements_reports_elements_without_svg(project, kernel, capsys):
+    kernel.failing_views.add('Tree')
+
+    assert not cli.visualize_elements('out.svg', ['Vehicle'], use_cache=False)
+    assert "Failed to generate SVG for Vehicle" in capsys.readouterr().out
+    assert not (project / 'out_Vehicle.svg').exists()
+
+
+def test_visualize_file_reuses_cached_svg_without_kernel(project, kernel):
+    cache_dir = str(project / 'cache')
+
+    assert cli.visualize_file('out.svg', element='Vehicle', cache_dir=cache_dir)
+    (project / 'out.svg').unlink()
+    kernel.executed.clear()
+
+    assert cli.visualize_file('out.svg', element='Vehicle', cache_dir=cache_dir)
+    assert kernel.executed == []
+    assert (project / 'out.svg').read_text() == '<svg>Tree Vehicle</svg>'
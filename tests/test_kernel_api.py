@@ -0,0 +1,107 @@
+"""Tests for the kernel API against an in-process fake of jupyter_client."""
+
+import asyncio
+
+import pytest
+
+from sysml_v2_visualizer.kernel_api import AsyncSysMLKernelAPI, SysMLKernelAPI
+
+MODEL = "package Vehicle { part def Engine; }"
+
+
+def test_visualize_detects_package(kernel):
+    with SysMLKernelAPI() as api:
+        outputs = api.visualize(MODEL, view='Interconnection')
+
+    assert kernel.executed == [MODEL, '%viz --view Interconnection Vehicle']
+    assert {'type': 'stream', 'name': 'stdout', 'text': 'ok'} in outputs
+    assert 'noise' not in str(outputs)
+
+
+def test_visualize_falls_back_to_tree_view(kernel, tmp_path):
+    kernel.failing_views.add('Interconnection')
+    output_file = str(tmp_path / 'out.svg')
+
+    with SysMLKernelAPI() as api:
+        api.visualize_content(MODEL, output_file, view='Interconnection', element='Vehicle::Engine')
+
+    assert kernel.executed[1:] == ['%viz --view Interconnection Vehicle::Engine', '%viz --view Tree Vehicle::Engine']
+    assert (tmp_path / 'out.svg').read_text() == '<svg>Tree Vehicle::Engine</svg>'
+
+
+def test_visualize_batch_executes_model_once(kernel, tmp_path):
+    targets = [('Vehicle', str(tmp_path / 'a.svg')), ('Vehicle::Engine', str(tmp_path / 'b.svg'))]
+
+    with SysMLKernelAPI() as api:
+        results = api.visualize_batch(MODEL, targets)
+
+    assert results == targets
+    assert kernel.executed.count(MODEL) == 1
+    assert (tmp_path / 'b.svg').read_text() == '<svg>Tree Vehicle::Engine</svg>'
+
+
+def test_kernel_that_never_becomes_ready_is_replaced(kernel, tmp_path):
+    kernel.unready_starts = 1
+
+    with SysMLKernelAPI() as api:
+        with pytest.raises(RuntimeError, match="failed to start"):
+            api.visualize_content(MODEL, str(tmp_path / 'out.svg'), element='Vehicle')
+        assert api.km is None and kernel.shutdowns == 1
+        assert kernel.executed == []
+
+        api.visualize_content(MODEL, str(tmp_path / 'out.svg'), element='Vehicle')
+
+    assert (tmp_path / 'out.svg').read_text() == '<svg>Tree Vehicle</svg>'
+
+
+def test_async_kernel_that_never_becomes_ready_is_replaced(kernel, tmp_path):
+    kernel.unready_starts = 1
+
+    async def run():
+        async with AsyncSysMLKernelAPI() as api:
+            with pytest.raises(RuntimeError, match="failed to start"):
+                await api.visualize_content(MODEL, str(tmp_path / 'out.svg'), element='Vehicle')
+            assert api.km is None
+            await api.visualize_content(MODEL, str(tmp_path / 'out.svg'), element='Vehicle')
+
+    asyncio.run(run())
+
+    assert (tmp_path / 'out.svg').read_text() == '<svg>Tree Vehicle</svg>'
+
+
+def test_async_api_matches_sync_api(kernel, tmp_path):
+    kernel.failing_views.add('Interconnection')
+
+    async def run():
+        async with AsyncSysMLKernelAPI() as api:
+            outputs = await api.visualize(MODEL, view='Interconnection')
+            await api.visualize_content(MODEL, str(tmp_path / 'one.svg'), element='Vehicle')
+            results = await api.visualize_batch(MODEL, [('Vehicle::Engine', str(tmp_path / 'two.svg'))])
+        return outputs, results
+
+    outputs, results = asyncio.run(run())
+
+    assert kernel.executed == [
+        MODEL,
+        '%viz --view Interconnection Vehicle',
+        '%viz --view Tree Vehicle',
+        '%viz --view Tree Vehicle',
+        '%viz --view Tree Vehicle::Engine',
+    ]
+    assert '<svg>Tree Vehicle</svg>' in str(outputs)
+    assert results == [('Vehicle::Engine', str(tmp_path / 'two.svg'))]
+    assert (tmp_path / 'one.svg').read_text() == '<svg>Tree Vehicle</svg>'
+
+
+def test_visualize_content_serves_cached_svg(kernel, tmp_path, monkeypatch):
+    from sysml_v2_visualizer import utils
+
+    monkeypatch.setattr(utils, '_sysml_kernel_fingerprint', lambda: "")
+    cache_dir = str(tmp_path / 'cache')
+
+    with SysMLKernelAPI() as api:
+        api.visualize_content(MODEL, str(tmp_path / 'a.svg'), element='Vehicle', use_cache=True, cache_dir=cache_dir)
+        api.visualize_content(MODEL, str(tmp_path / 'b.svg'), element='Vehicle', use_cache=True, cache_dir=cache_dir)
+
+    assert kernel.executed == [MODEL, '%viz --view Tree Vehicle']
+    assert (tmp_path / 'b.svg').read_text() == '<svg>Tree Vehicle</svg>'
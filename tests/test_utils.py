@@ -0,0 +1,164 @@
+"""Tests for SysML file selection and the rendered-SVG cache."""
+
+import pytest
+
+from sysml_v2_visualizer import utils
+from sysml_v2_visualizer.utils import (
+    combine_sysml_files,
+    find_sysml_files,
+    load_cached_svg,
+    select_sysml_files_for_element,
+    store_cached_svg,
+    svg_cache_key,
+)
+
+
+@pytest.fixture
+def model_files(tmp_path):
+    """Write a small multi-file model and return its paths by short name."""
+    sources = {
+        'vehicle': "package 'Vehicle Model' { import Parts::*; part engine : Parts::Engine; }",
+        'parts': "package Parts { import Units::*; part def Engine; }",
+        'units': "package Units { attribute def Power; }",
+        'other': "package Other { // package Parts\n part def Unrelated; }",
+        'root': "part def RootLevel;",
+    }
+    paths = {}
+    for name, source in sources.items():
+        path = tmp_path / f"{name}.sysml"
+        path.write_text(source, encoding='utf-8')
+        paths[name] = str(path)
+    return paths
+
+
+def _select(model_files, elements):
+    selected = select_sysml_files_for_element(list(model_files.values()), elements)
+    return [name for name, path in model_files.items() if path in selected]
+
+
+def test_select_follows_references_across_files(model_files):
+    assert _select(model_files, ['Parts::Engine']) == ['parts', 'units', 'root']
+
+
+def test_select_follows_bare_package_references(tmp_path):
+    app = tmp_path / 'app.sysml'
+    app.write_text("package App { alias P for Parts; part e : P::Engine; }")
+    parts = tmp_path / 'parts.sysml'
+    parts.write_text("package Parts { part def Engine; }")
+    imported = tmp_path / 'imported.sysml'
+    imported.write_text("package Lib { import Units; expose Other; }")
+    units = tmp_path / 'units.sysml'
+    units.write_text("package Units;")
+    other = tmp_path / 'other.sysml'
+    other.write_text("package Other;")
+    file_paths = [str(app), str(parts), str(imported), str(units), str(other)]
+
+    assert select_sysml_files_for_element(file_paths, ['App::e']) == [str(app), str(parts)]
+    assert select_sysml_files_for_element(file_paths, ['Lib']) == [str(imported), str(units), str(other)]
+
+
+def test_select_quoted_package_name(model_files):
+    assert _select(model_files, ["'Vehicle Model'::engine"]) == ['vehicle', 'parts', 'units', 'root']
+
+
+def test_select_several_elements(model_files):
+    assert _select(model_files, ['Units', 'Other::Unrelated']) == ['units', 'other', 'root']
+
+
+def test_select_unknown_package_keeps_all_files(model_files):
+    assert _select(model_files, ['Parts::Engine', 'Missing::Thing']) == list(model_files)
+    assert _select(model_files, []) == list(model_files)
+
+
+def test_select_rereads_edited_files(model_files):
+    with open(model_files['units'], 'a', encoding='utf-8') as f:
+        f.write("\npackage Extra { attribute def Torque; }")
+    assert _select(model_files, ['Extra']) == ['units', 'root']
+
+
+def test_find_sysml_files_prunes_hidden_and_build_directories(tmp_path):
+    for name in ('a.sysml', 'B.SysML', 'notes.txt', 'sub/c.sysml', '.git/d.sysml', 'build/e.sysml',
+                 'dist/f.sysml', 'node_modules/g.sysml', 'generated/h.sysml'):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("package P;")
+
+    found = find_sysml_files(str(tmp_path))
+    assert found == sorted(str(tmp_path / name) for name in ('a.sysml', 'B.SysML', 'generated/h.sysml', 'sub/c.sysml'))
+
+    found = find_sysml_files(str(tmp_path), exclude=['generated'])
+    assert found == sorted(str(tmp_path / name) for name in ('a.sysml', 'B.SysML', 'sub/c.sysml'))
+
+
+def test_find_sysml_files_defaults_to_cwd(tmp_path, monkeypatch):
+    (tmp_path / 'a.sysml').write_text("package P;")
+    monkeypatch.chdir(tmp_path)
+
+    assert find_sysml_files() == [str(tmp_path / 'a.sysml')]
+
+
+def test_combine_sysml_files_matches_joined_text(tmp_path, capsys):
+    sources = ["package A;", "package B { part def \u00e9; }\n", ""]
+    paths = []
+    for i, source in enumerate(sources):
+        path = tmp_path / f"{i}.sysml"
+        path.write_text(source, encoding='utf-8')
+        paths.append(str(path))
+    missing = str(tmp_path / 'missing.sysml')
+
+    # The format of the original implementation: a header per file and a
+    # blank line between files
+    expected_parts = []
+    for path, source in zip(paths, sources):
+        expected_parts += [f"// From file: {path}", source, ""]
+
+    assert combine_sysml_files(paths[:1] + [missing] + paths[1:]) == "\n".join(expected_parts)
+    assert f"Could not read {missing}" in capsys.readouterr().out
+    assert combine_sysml_files([]) == ""
+
+
+@pytest.fixture
+def no_kernel(monkeypatch):
+    """Keep cache keys independent of the locally installed SysML kernel."""
+    monkeypatch.setattr(utils, '_sysml_kernel_fingerprint', lambda: "")
+
+
+def test_svg_cache_key_covers_content_and_options(no_kernel):
+    key = svg_cache_key("package A;", "Tree", None, "A")
+    assert key == svg_cache_key("package A;", "Tree", None, "A")
+    assert key != svg_cache_key("package B;", "Tree", None, "A")
+    assert key != svg_cache_key("package A;", "State", None, "A")
+    assert key != svg_cache_key("package A;", "Tree", "stdcolor", "A")
+    assert key != svg_cache_key("package A;", "Tree", None, "A::X")
+
+
+def test_svg_cache_key_covers_kernel(monkeypatch):
+    monkeypatch.setattr(utils, '_sysml_kernel_fingerprint', lambda: "kernel-1")
+    key = svg_cache_key("package A;")
+    monkeypatch.setattr(utils, '_sysml_kernel_fingerprint', lambda: "kernel-2")
+    assert key != svg_cache_key("package A;")
+
+
+def test_svg_cache_hit_and_miss(tmp_path, no_kernel):
+    cache_dir = str(tmp_path / 'cache')
+    key = svg_cache_key("package A;")
+    output_file = tmp_path / 'out.svg'
+
+    assert not load_cached_svg(key, str(output_file), cache_dir)
+    assert not output_file.exists()
+
+    rendered = tmp_path / 'rendered.svg'
+    rendered.write_text("<svg>A</svg>")
+    store_cached_svg(key, str(rendered), cache_dir)
+
+    assert load_cached_svg(key, str(output_file), cache_dir)
+    assert output_file.read_text() == "<svg>A</svg>"
+    assert list((tmp_path / 'cache').iterdir()) == [tmp_path / 'cache' / f"{key}.svg"]
+
+
+def test_unreadable_cache_entry_is_a_miss(tmp_path, capsys):
+    cache_dir = tmp_path / 'cache'
+    (cache_dir / 'key.svg').mkdir(parents=True)
+
+    assert not load_cached_svg('key', str(tmp_path / 'out.svg'), str(cache_dir))
+    assert "Could not read cached SVG" in capsys.readouterr().out